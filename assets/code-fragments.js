@@ -0,0 +1,38 @@
+// Expands code blocks the generator moved out of the page into fragment
+// files under assets/_build/code/. Each block is fetched when its
+// "Show all" link is clicked; without JavaScript the link opens the fragment.
+(function () {
+    'use strict';
+
+    document.addEventListener('click', event => {
+        const link = event.target.closest('.code-expand');
+        if (!link) {
+            return;
+        }
+        event.preventDefault();
+
+        const fragment = link.closest('.code-fragment');
+        if (fragment.dataset.loading) {
+            return;
+        }
+        fragment.dataset.loading = 'true';
+        const label = link.textContent;
+        link.textContent = 'Loading…';
+
+        fetch(link.href)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            })
+            .then(html => {
+                fragment.outerHTML = html;
+            })
+            .catch(() => {
+                link.textContent = label;
+                delete fragment.dataset.loading;
+                window.location.href = link.href;
+            });
+    });
+})();
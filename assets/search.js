@@ -0,0 +1,178 @@
+// Client-side search over the prebuilt index in search/.
+// The index is sharded by term prefix, so a query only downloads the shards
+// covering its own terms.
+(function () {
+    'use strict';
+
+    const container = document.querySelector('.nav-search');
+    if (!container) {
+        return;
+    }
+
+    const root = container.dataset.root || '';
+    const input = container.querySelector('.search-input');
+    const results = container.querySelector('.search-results');
+    const shards = new Map();
+    let metaPromise = null;
+    let latestQuery = 0;
+
+    function fetchIndexFile(name) {
+        return fetch(root + 'search/' + name)
+            .then(response => (response.ok ? response.json() : {}))
+            .catch(() => ({}));
+    }
+
+    function loadMeta() {
+        if (!metaPromise) {
+            metaPromise = fetchIndexFile('docs.json').then(meta => ({
+                docs: meta.docs || [],
+                prefix: meta.prefix || 2,
+                complete: meta.complete || 3,
+                shards: meta.shards || [],
+                stopwords: new Set(meta.stopwords || []),
+                capped: new Set(meta.capped || [])
+            }));
+        }
+        return metaPromise;
+    }
+
+    function loadShard(key) {
+        if (!shards.has(key)) {
+            shards.set(key, fetchIndexFile(key + '.json'));
+        }
+        return shards.get(key);
+    }
+
+    function tokenize(query, meta) {
+        const terms = query.toLowerCase().match(/[a-z0-9]+/g) || [];
+        return terms.filter(term => term.length >= meta.prefix && !meta.stopwords.has(term));
+    }
+
+    async function matchTerm(term, meta) {
+        // Large prefixes are split into longer-keyed shards, so a term needs
+        // every shard whose key is a prefix of it or starts with it. Very short
+        // terms only match whole terms to avoid downloading every completion.
+        const complete = term.length >= meta.complete;
+        const keys = meta.shards.filter(
+            key => term.startsWith(key) || (complete && key.startsWith(term))
+        );
+        const loaded = await Promise.all(keys.map(loadShard));
+        const matches = new Map();
+        let capped = false;
+        for (const shard of loaded) {
+            // Postings are flat [docId, score, docId, score, ...] arrays
+            for (const [key, postings] of Object.entries(shard)) {
+                if (complete ? !key.startsWith(term) : key !== term) {
+                    continue;
+                }
+                // Capped terms only list their best posts, not every post they occur in
+                capped = capped || meta.capped.has(key);
+                const factor = key === term ? 1 : 0.5;
+                for (let i = 0; i < postings.length; i += 2) {
+                    const score = postings[i + 1] * factor;
+                    matches.set(postings[i], Math.max(matches.get(postings[i]) || 0, score));
+                }
+            }
+        }
+        return { matches, capped };
+    }
+
+    async function search(query) {
+        const meta = await loadMeta();
+        const terms = tokenize(query, meta);
+        if (!terms.length) {
+            return [];
+        }
+
+        const perTerm = await Promise.all(terms.map(term => matchTerm(term, meta)));
+
+        // A document must match every complete term; capped terms cannot rule
+        // a document out, they only add to its score. Scores add up across terms.
+        const complete = perTerm.filter(term => !term.capped);
+        const capped = perTerm.filter(term => term.capped);
+        let totals;
+        if (complete.length) {
+            totals = new Map(complete[0].matches);
+            for (const { matches } of complete.slice(1)) {
+                for (const docId of totals.keys()) {
+                    if (matches.has(docId)) {
+                        totals.set(docId, totals.get(docId) + matches.get(docId));
+                    } else {
+                        totals.delete(docId);
+                    }
+                }
+            }
+        } else {
+            // Only very common terms: rank the posts any of them lists best
+            totals = new Map();
+        }
+        for (const { matches } of capped) {
+            for (const [docId, score] of matches) {
+                if (totals.has(docId) || !complete.length) {
+                    totals.set(docId, (totals.get(docId) || 0) + score);
+                }
+            }
+        }
+
+        return [...totals.entries()]
+            .sort((a, b) => b[1] - a[1])
+            .slice(0, 10)
+            .map(([docId]) => meta.docs[docId])
+            .filter(Boolean);
+    }
+
+    function render(docs, query) {
+        results.textContent = '';
+        if (!query.trim()) {
+            results.hidden = true;
+            return;
+        }
+        if (!docs.length) {
+            const empty = document.createElement('li');
+            empty.className = 'search-empty';
+            empty.textContent = 'No matching posts';
+            results.appendChild(empty);
+        }
+        for (const [title, url, kind, date] of docs) {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.href = root + url;
+            link.textContent = title;
+            const meta = document.createElement('span');
+            meta.className = 'search-meta';
+            meta.textContent = (kind === 'writeup' ? 'Writeup' : 'Blog') + ' · ' + date;
+            item.appendChild(link);
+            item.appendChild(meta);
+            results.appendChild(item);
+        }
+        results.hidden = false;
+    }
+
+    let timer = null;
+    input.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(() => {
+            const query = input.value;
+            const queryId = ++latestQuery;
+            search(query).then(docs => {
+                // Ignore answers to queries the user has already typed past
+                if (queryId === latestQuery) {
+                    render(docs, query);
+                }
+            });
+        }, 120);
+    });
+
+    input.addEventListener('keydown', event => {
+        if (event.key === 'Escape') {
+            input.value = '';
+            results.hidden = true;
+        }
+    });
+
+    document.addEventListener('click', event => {
+        if (!container.contains(event.target)) {
+            results.hidden = true;
+        }
+    });
+})();
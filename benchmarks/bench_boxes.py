@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for custom info boxes.
+
+Compares the old five-pass regex substitution of Start*Box/End*Box markers
+against the single-pass CustomBoxPreprocessor, both on its own and as part
+of a full markdown conversion of a post with hundreds of boxes. Before
+timing, a few malformed-marker posts are rendered to check that crossed,
+stray and code-quoted markers degrade to plain text instead of failing.
+
+Usage: python benchmarks/bench_boxes.py [--boxes N] [--rounds R]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import markdown  # noqa: E402
+
+from nyx_markdown import CUSTOM_BOX_CLASSES, CustomBoxExtension  # noqa: E402
+
+EXTENSIONS = ['meta', 'toc', 'fenced_code', 'tables', 'nl2br']
+
+# (source, number of boxes rendered, number of warnings) for markers the scan must survive
+EDGE_CASES = {
+    'crossed': ("StartGreenBox\n\na\n\nStartRedBox\n\nb\n\nEndGreenBox\n\nEndRedBox\n", 1, 2),
+    'stray': ("EndBlueBox before any box\n\nStartBlueBox\n\nok\n\nEndBlueBox\n", 1, 1),
+    'code': ("Write `StartGreenBox` and ``EndRedBox``.\n\n```\nStartRedBox\n```\n", 0, 0),
+}
+
+
+def legacy_process_custom_boxes(content):
+    """The previous approach: one DOTALL regex pass per box kind"""
+    box_patterns = {
+        'StartGreenBox': ('success-box', 'EndGreenBox'),
+        'StartRedBox': ('danger-box', 'EndRedBox'),
+        'StartBlueBox': ('info-box', 'EndBlueBox'),
+        'StartPurpleBox': ('note-box', 'EndPurpleBox'),
+        'StartYellowBox': ('warning-box', 'EndYellowBox')
+    }
+
+    processed_content = content
+
+    for start_tag, (css_class, end_tag) in box_patterns.items():
+        pattern = f"{start_tag}(.*?){end_tag}"
+
+        def replace_box(match):
+            box_content = match.group(1).strip()
+            return f'<div class="{css_class}">{box_content}</div>'
+
+        processed_content = re.sub(pattern, replace_box, processed_content, flags=re.DOTALL)
+
+    return processed_content
+
+
+def make_post(boxes):
+    """Build a synthetic post alternating prose paragraphs and boxes of every kind"""
+    kinds = list(CUSTOM_BOX_CLASSES)
+    parts = ["title: Box heavy post", "date: 2025-01-01", ""]
+    for n in range(boxes):
+        kind = kinds[n % len(kinds)]
+        parts.append(f"Paragraph {n} walks through the loader stage and the `payload.bin` it drops.\n")
+        parts.append(f"Start{kind}Box")
+        parts.append(f"Note {n}: keep the sample inside the **isolated** VM.")
+        parts.append(f"End{kind}Box\n")
+    return "\n".join(parts)
+
+
+def check_edge_cases():
+    """Render the malformed-marker posts and fail loudly if any regresses"""
+    boxes = CustomBoxExtension()
+    md = markdown.Markdown(extensions=EXTENSIONS + [boxes])
+    for name, (source, box_count, warning_count) in EDGE_CASES.items():
+        md.reset()
+        html = md.convert(source)
+        found = (html.count('<div class='), len(boxes.warnings))
+        if found != (box_count, warning_count):
+            sys.exit(f"Edge case {name!r}: expected {box_count} boxes / {warning_count} warnings, "
+                     f"got {found[0]} / {found[1]}: {boxes.warnings}")
+    print(f"Edge cases: {len(EDGE_CASES)} malformed-marker posts render as expected")
+
+
+def run(label, convert, source, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        html = convert(source)
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{label:<22} {elapsed * 1000:>9.2f} ms/post  ({len(html) / 1024:.0f} KB out)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--boxes', type=int, default=500, help="number of boxes in the post")
+    parser.add_argument('--rounds', type=int, default=20, help="conversions per measurement")
+    args = parser.parse_args()
+
+    check_edge_cases()
+    source = make_post(args.boxes)
+    print(f"Synthetic post: {args.boxes} boxes, {len(source) / 1024:.0f} KB of markdown")
+
+    boxes = CustomBoxExtension()
+    md_legacy = markdown.Markdown(extensions=EXTENSIONS)
+    md_boxes = markdown.Markdown(extensions=EXTENSIONS + [boxes])
+    lines = source.split("\n")
+
+    before = run("regex passes", legacy_process_custom_boxes, source, args.rounds)
+    after = run("single-pass scan", lambda _: "\n".join(boxes.preprocessor.run(lines)), source, args.rounds)
+    print(f"Marker scan speedup: {before / after:.2f}x")
+
+    def legacy_convert(text):
+        md_legacy.reset()
+        return md_legacy.convert(legacy_process_custom_boxes(text))
+
+    def block_convert(text):
+        md_boxes.reset()
+        return md_boxes.convert(text)
+
+    before = run("regex + markdown", legacy_convert, source, args.rounds)
+    after = run("block processor", block_convert, source, args.rounds)
+    print(f"Full render speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+End-to-end build benchmark.
+
+Generates a synthetic Blog/Writeups tree (see benchmarks/synthetic.py) in a
+temporary directory and runs PortfolioGenerator.generate_all_pages against
+it. Each run happens in a fresh subprocess so peak RSS is per run. Records
+wall time, peak RSS and per-file throughput for a cold build (.nyx-cache
+removed first) and a warm rebuild (populated cache), and writes the results
+as JSON.
+
+Compare against a saved result to catch regressions:
+
+    python benchmarks/bench_build.py --output baseline.json
+    python benchmarks/bench_build.py --baseline baseline.json --threshold 10
+
+exits with status 1 when any scenario's median wall time or peak RSS grew
+by more than the threshold percentage.
+
+Usage: python benchmarks/bench_build.py [--posts N] [--writeups N] [--runs R] ...
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from synthetic import generate_tree  # noqa: E402
+
+SCENARIOS = ('cold', 'warm')
+METRICS = ('wall_seconds', 'peak_rss_kb')
+
+
+def peak_rss_kb():
+    """Peak RSS of this process and its worker processes, in KiB"""
+    scale = 1024 if sys.platform == 'darwin' else 1
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+    workers = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale
+    return max(own, workers)
+
+
+def run_child(args):
+    """Run one build in the current directory and print its measurements as JSON"""
+    from main import CACHE_DIR_NAME, PortfolioGenerator
+
+    if args.scenario == 'cold':
+        # Drop every on-disk cache (posts, highlight, images, search)
+        shutil.rmtree(CACHE_DIR_NAME, ignore_errors=True)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        generator = PortfolioGenerator(
+            jobs=args.jobs,
+            optimize_images=not args.no_images,
+            search_index=not args.no_search,
+        )
+        start = time.perf_counter()
+        blogs, writeups = generator.generate_all_pages()
+        wall = time.perf_counter() - start
+
+    files = len(blogs) + len(writeups)
+    print(json.dumps({
+        'scenario': args.scenario,
+        'wall_seconds': round(wall, 4),
+        'peak_rss_kb': peak_rss_kb(),
+        'files': files,
+        'files_per_second': round(files / wall, 2) if wall else None,
+        'parsed': generator.parsed_count,
+        'cached': generator.cached_count,
+    }))
+
+
+def run_build(tree, scenario, args):
+    """Build the tree once in a fresh interpreter and return its measurements"""
+    command = [sys.executable, str(Path(__file__).resolve()), '--child', scenario]
+    if args.jobs is not None:
+        command += ['--jobs', str(args.jobs)]
+    if args.no_images:
+        command.append('--no-images')
+    if args.no_search:
+        command.append('--no-search')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get('PYTHONPATH')])))
+    completed = subprocess.run(command, cwd=tree, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        sys.stderr.write(completed.stderr)
+        raise SystemExit(f"Build failed in scenario '{scenario}'")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    """Median of each measurement per scenario"""
+    summary = {}
+    for scenario in SCENARIOS:
+        rows = [run for run in runs if run['scenario'] == scenario]
+        if not rows:
+            continue
+        summary[scenario] = {
+            'runs': len(rows),
+            'files': rows[0]['files'],
+            'wall_seconds': round(statistics.median(row['wall_seconds'] for row in rows), 4),
+            'peak_rss_kb': int(statistics.median(row['peak_rss_kb'] for row in rows)),
+            'files_per_second': round(statistics.median(row['files_per_second'] for row in rows), 2),
+        }
+    return summary
+
+
+def git_revision():
+    """Current commit of the repository, if available"""
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                   capture_output=True, text=True, check=True)
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(summary, baseline, threshold):
+    """Return a list of regressions beyond threshold percent"""
+    regressions = []
+    for scenario, current in summary.items():
+        previous = baseline.get('summary', {}).get(scenario)
+        if not previous:
+            continue
+        for metric in METRICS:
+            before, after = previous[metric], current[metric]
+            if not before:
+                continue
+            change = (after - before) / before * 100
+            print(f"{scenario:>5} {metric:<13} {before:>12} -> {after:<12} {change:+.1f}%")
+            if change > threshold:
+                regressions.append(f"{scenario} {metric} regressed {change:.1f}% (threshold {threshold}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end build benchmark")
+    parser.add_argument('--posts', type=int, default=200, help="synthetic blog posts")
+    parser.add_argument('--writeups', type=int, default=100, help="synthetic writeups")
+    parser.add_argument('--code-blocks', type=int, default=4, help="fenced code blocks per post")
+    parser.add_argument('--boxes', type=int, default=3, help="custom boxes per post")
+    parser.add_argument('--images', type=int, default=1, help="images per post")
+    parser.add_argument('--runs', type=int, default=3, help="runs per scenario")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="worker processes for the build")
+    parser.add_argument('--no-images', action='store_true', help="skip responsive image generation")
+    parser.add_argument('--no-search', action='store_true', help="skip the search index")
+    parser.add_argument('--output', help="write results JSON to this file")
+    parser.add_argument('--baseline', help="results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="allowed regression in percent when comparing against --baseline")
+    parser.add_argument('--keep', action='store_true', help="keep the generated tree")
+    parser.add_argument('--child', choices=SCENARIOS, dest='scenario', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        run_child(args)
+        return
+
+    tree = tempfile.mkdtemp(prefix='nyx-bench-')
+    count = generate_tree(tree, args.posts, args.writeups, args.code_blocks, args.boxes, args.images)
+    print(f"Synthetic tree: {count} posts in {tree}")
+
+    runs = []
+    try:
+        for scenario in SCENARIOS:
+            for number in range(args.runs):
+                result = run_build(tree, scenario, args)
+                runs.append(result)
+                print(f"{scenario:>5} run {number + 1}: {result['wall_seconds']:.3f}s, "
+                      f"{result['peak_rss_kb'] / 1024:.1f} MiB peak, "
+                      f"{result['files_per_second']:.1f} files/s")
+    finally:
+        if not args.keep:
+            shutil.rmtree(tree, ignore_errors=True)
+
+    summary = summarize(runs)
+    results = {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'params': {
+                'posts': args.posts, 'writeups': args.writeups, 'code_blocks': args.code_blocks,
+                'boxes': args.boxes, 'images': args.images, 'jobs': args.jobs,
+                'no_images': args.no_images, 'no_search': args.no_search,
+            },
+        },
+        'summary': summary,
+        'runs': runs,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n", encoding='utf-8')
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        if baseline.get('meta', {}).get('params') != results['meta']['params']:
+            print("Warning: baseline was recorded with different parameters")
+        regressions = compare(summary, baseline, args.threshold)
+        if regressions:
+            for regression in regressions:
+                print(f"REGRESSION: {regression}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold}%")
+
+
+if __name__ == "__main__":
+    main()
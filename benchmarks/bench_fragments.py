@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark for offloading oversized code blocks into fragment files.
+
+Builds the heaviest existing writeup in a scratch copy of the site twice:
+with code fragments disabled (before) and with the default threshold
+(after). The same is done for a dump-heavy variant of it with a long hex
+dump and deobfuscated script appended, which is what the threshold is for.
+Reports page HTML bytes (raw and gzip) and the time to parse the page with
+html.parser, which stands in for the browser's time to first render.
+
+Usage: python benchmarks/bench_fragments.py [--dump-lines N] [--rounds R]
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from main import CODE_FRAGMENT_KB, PortfolioGenerator  # noqa: E402
+
+
+def heaviest_writeup():
+    """Folder of the writeup with the largest markdown source"""
+    sources = sorted((REPO_ROOT / "Writeups").glob("*/index.md"), key=lambda path: path.stat().st_size)
+    return sources[-1].parent
+
+
+def dump_blocks(lines):
+    """A hex dump and a deobfuscated script, as pasted into malware writeups"""
+    dump = "\n".join(f"{offset * 16:08x}: " + " ".join(f"{(offset * 7 + n) % 256:02x}" for n in range(16))
+                     + "  ................" for offset in range(lines))
+    script = "\n".join(f"$s{n} = [System.Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($b{n}))"
+                       f"; Invoke-Expression $s{n}  # stage {n}" for n in range(lines // 2))
+    return f"\n\n## Appendix: memory dump\n\n```text\n{dump}\n```\n\n" \
+           f"## Appendix: deobfuscated loader\n\n```powershell\n{script}\n```\n"
+
+
+def build_page(site_dir, post_dir, code_fragment_kb):
+    """Build one post into a fresh output directory; returns (page bytes, fragment bytes)"""
+    output_dir = site_dir / f"out-{code_fragment_kb}"
+    with contextlib.chdir(site_dir), contextlib.redirect_stdout(io.StringIO()):
+        generator = PortfolioGenerator(use_cache=False, highlight_cache=False, jobs=1, optimize_images=False,
+                                       search_index=False, compress=False, output_dir=output_dir,
+                                       code_fragment_kb=code_fragment_kb)
+        generator.generate_post_subset([str(post_dir.relative_to(site_dir))])
+    page = (output_dir / post_dir.relative_to(site_dir) / f"{post_dir.name}.html").read_bytes()
+    fragments = sum(path.stat().st_size for path in (output_dir / "assets" / "_build" / "code").glob("*.html"))
+    return page, fragments
+
+
+def parse_ms(page, rounds):
+    text = page.decode('utf-8')
+    times = []
+    # The first parse also pays for warming up the parser's regexes
+    for _ in range(rounds + 1):
+        parser = HTMLParser()
+        start = time.perf_counter()
+        parser.feed(text)
+        parser.close()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times[1:]) * 1000
+
+
+def report(label, site_dir, post_dir, rounds):
+    print(label)
+    results = []
+    for name, code_fragment_kb in (("before", 0), ("after", CODE_FRAGMENT_KB)):
+        page, fragments = build_page(site_dir, post_dir, code_fragment_kb)
+        results.append((len(page), parse_ms(page, rounds)))
+        print(f"  {name:<7} {len(page) / 1024:>8.1f} KB html  {len(gzip.compress(page)) / 1024:>7.1f} KB gzip  "
+              f"{results[-1][1]:>7.2f} ms parse  ({fragments / 1024:.1f} KB in fragments)")
+    (before_bytes, before_ms), (after_bytes, after_ms) = results
+    print(f"  page bytes {100 * after_bytes / before_bytes:.0f}% of before, parse speedup {before_ms / after_ms:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dump-lines', type=int, default=2000, help="lines in the appended hex dump")
+    parser.add_argument('--rounds', type=int, default=20, help="parses per measurement")
+    args = parser.parse_args()
+
+    source_dir = heaviest_writeup()
+    with tempfile.TemporaryDirectory() as tmp:
+        site_dir = Path(tmp)
+        for name in ('templates', 'assets'):
+            shutil.copytree(REPO_ROOT / name, site_dir / name, ignore=shutil.ignore_patterns('_build', '*.gz'))
+        post_dir = site_dir / "Writeups" / source_dir.name
+        shutil.copytree(source_dir, post_dir, ignore=shutil.ignore_patterns('*.html', '*.gz'))
+        report(f"Heaviest writeup: {source_dir.name} (threshold {CODE_FRAGMENT_KB} KB)", site_dir, post_dir, args.rounds)
+
+        heavy_dir = post_dir.with_name(f"{source_dir.name}-dumps")
+        shutil.copytree(post_dir, heavy_dir)
+        with open(heavy_dir / "index.md", 'a', encoding='utf-8') as f:
+            f.write(dump_blocks(args.dump_lines))
+        report(f"Same writeup with a {args.dump_lines}-line dump appended", site_dir, heavy_dir, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
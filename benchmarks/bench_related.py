@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the related-posts similarity pass.
+
+Builds synthetic term vectors shaped like RelatedPosts.post_terms output
+(a few shared topic terms plus a long tail) and times RelatedPosts.similar
+for growing corpus sizes, with NumPy when it is installed and with the
+pure-Python fallback, checking that both pick the same posts.
+
+Usage: python benchmarks/bench_related.py [--posts N [N ...]] [--python-limit N]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import nyx_related  # noqa: E402
+
+
+def make_vectors(count, rng):
+    """Vectors with RELATED_MAX_TERMS terms: topic terms shared by many posts, the rest rarer"""
+    topics = [f"topic{n}" for n in range(200)]
+    vocabulary = [f"term{n}" for n in range(max(5000, count * 5))]
+    vectors = []
+    for _ in range(count):
+        terms = rng.sample(topics, 6) + rng.sample(vocabulary, nyx_related.RELATED_MAX_TERMS - 6)
+        vectors.append({term: rng.randint(1, 16) for term in terms})
+    return vectors
+
+
+def timed(related, vectors, use_numpy):
+    nyx_related.NUMPY_AVAILABLE = use_numpy
+    start = time.perf_counter()
+    result = related.similar(vectors)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--posts', type=int, nargs='+', default=[500, 2000, 5000], help="corpus sizes")
+    parser.add_argument('--python-limit', type=int, default=2000,
+                        help="largest corpus also timed with the pure-Python fallback")
+    args = parser.parse_args()
+
+    has_numpy = nyx_related.NUMPY_AVAILABLE
+    if not has_numpy:
+        print("NumPy not installed: timing the pure-Python fallback only")
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        related = nyx_related.RelatedPosts(tmp, use_cache=False)
+        for count in args.posts:
+            vectors = make_vectors(count, rng)
+            line = f"{count:>6} posts"
+            numpy_result = python_result = None
+            if has_numpy:
+                numpy_result, seconds = timed(related, vectors, True)
+                line += f"  numpy {seconds * 1000:>9.0f} ms"
+            if count <= args.python_limit or not has_numpy:
+                python_result, seconds = timed(related, vectors, False)
+                line += f"  python {seconds * 1000:>9.0f} ms"
+            if numpy_result is not None and python_result is not None:
+                line += "  (same results)" if numpy_result == python_result else "  (RESULTS DIFFER)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the client-side search index.
+
+Builds the prefix-sharded index for a synthetic corpus, reports its size,
+and measures query latency by replaying what assets/search.js does: load
+the shard for each query term's prefix, prefix-match terms and intersect
+the postings of every term that is not capped.
+
+Usage: python benchmarks/bench_search.py [--posts N] [--words W] [--queries Q]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from nyx_search import SearchIndexer  # noqa: E402
+
+
+def make_vocabulary(size, rng):
+    """Random pronounceable-ish words standing in for a technical vocabulary"""
+    syllables = ["mal", "ware", "dark", "gate", "ob", "fus", "cat", "shell", "code", "pay",
+                 "load", "hex", "dump", "reg", "key", "net", "proc", "mem", "pe", "dll",
+                 "inj", "ect", "loa", "der", "str", "ing", "crypt", "xor", "base", "sixty"]
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(syllables) for _ in range(rng.randint(1, 3))))
+    return sorted(words)
+
+
+def make_posts(count, words_per_post, rng):
+    vocabulary = make_vocabulary(20000, rng)
+    # Zipf-like weights so a few terms are very common, as in real prose
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    posts = []
+    for n in range(count):
+        words = rng.choices(vocabulary, weights=weights, k=words_per_post)
+        paragraphs = [" ".join(words[i:i + 80]) for i in range(0, len(words), 80)]
+        post = SimpleNamespace(
+            title=f"Post {n}: " + " ".join(rng.choices(vocabulary, k=5)),
+            tags=rng.sample(vocabulary[:200], 3),
+            category=rng.choice(["Malware Analysis", "CTF", "DFIR", "Reverse Engineering"]),
+            date=f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        )
+        posts.append((post, "".join(f"<p>{paragraph}</p>\n" for paragraph in paragraphs)))
+    return posts, vocabulary
+
+
+def build_index(indexer, posts):
+    """Feed every post to the indexer the way the build does, then build the files"""
+    indexer.reset()
+    for n, (post, content) in enumerate(posts):
+        indexer.add(post, f"Blog/post-{n}/post-{n}.html", 'blog', content)
+    return indexer.build()
+
+
+def run_query(index_dir, query, shard_cache, meta):
+    """Python port of the lookup in assets/search.js"""
+    terms = [term for term in query.split() if len(term) >= meta['prefix']]
+    capped_terms = set(meta.get('capped', []))
+    per_term = []
+    for term in terms:
+        matches = {}
+        capped = False
+        complete = len(term) >= meta['complete']
+        for shard_key in meta['shards']:
+            if not (term.startswith(shard_key) or (complete and shard_key.startswith(term))):
+                continue
+            if shard_key not in shard_cache:
+                shard_cache[shard_key] = json.loads((index_dir / f"{shard_key}.json").read_text())
+            for key, postings in shard_cache[shard_key].items():
+                if key.startswith(term) if complete else key == term:
+                    capped = capped or key in capped_terms
+                    factor = 1 if key == term else 0.5
+                    for i in range(0, len(postings), 2):
+                        matches[postings[i]] = max(matches.get(postings[i], 0), postings[i + 1] * factor)
+        per_term.append((matches, capped))
+    if not per_term:
+        return []
+    # Capped terms add to scores but never rule a document out
+    complete = [matches for matches, capped in per_term if not capped]
+    totals = dict(complete[0]) if complete else {}
+    for matches in complete[1:]:
+        totals = {doc: score + matches[doc] for doc, score in totals.items() if doc in matches}
+    for matches in (matches for matches, capped in per_term if capped):
+        for doc, score in matches.items():
+            if doc in totals or not complete:
+                totals[doc] = totals.get(doc, 0) + score
+    return sorted(totals, key=totals.get, reverse=True)[:10]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--posts', type=int, default=5000, help="number of synthetic posts")
+    parser.add_argument('--words', type=int, default=800, help="words per post body")
+    parser.add_argument('--queries', type=int, default=300, help="number of queries to time")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    posts, vocabulary = make_posts(args.posts, args.words, rng)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        indexer = SearchIndexer(temp_dir / "cache")
+
+        start = time.perf_counter()
+        files = build_index(indexer, posts)
+        cold_build = time.perf_counter() - start
+        start = time.perf_counter()
+        build_index(indexer, posts)
+        warm_build = time.perf_counter() - start
+
+        index_dir = temp_dir / "search"
+        index_dir.mkdir()
+        for name, content in files.items():
+            (index_dir / name).write_text(content, encoding='utf-8')
+
+        sizes = {name: len(content.encode('utf-8')) for name, content in files.items()}
+        shard_sizes = [size for name, size in sizes.items() if name != 'docs.json']
+        print(f"Corpus:       {args.posts} posts x {args.words} words")
+        print(f"Build:        {cold_build:.2f} s cold, {warm_build:.2f} s with cached term weights")
+        print(f"Index size:   {sum(sizes.values()) / 1024 / 1024:.1f} MB total in {len(shard_sizes)} shards")
+        print(f"docs.json:    {sizes['docs.json'] / 1024:.0f} KB")
+        print(f"Shard size:   median {statistics.median(shard_sizes) / 1024:.1f} KB, "
+              f"p95 {percentile(shard_sizes, 0.95) / 1024:.1f} KB, max {max(shard_sizes) / 1024:.1f} KB")
+
+        meta = json.loads((index_dir / "docs.json").read_text())
+        queries = []
+        for _ in range(args.queries):
+            words = rng.sample(vocabulary[:3000], rng.randint(1, 2))
+            # Type-ahead queries usually end in a partial word
+            words[-1] = words[-1][:max(2, len(words[-1]) - rng.randint(0, 3))]
+            queries.append(" ".join(words))
+
+        cold, warm = [], []
+        fetched = []
+        for query in queries:
+            shard_cache = {}
+            start = time.perf_counter()
+            run_query(index_dir, query, shard_cache, meta)
+            cold.append((time.perf_counter() - start) * 1000)
+            fetched.append(sum(sizes[f"{key}.json"] for key in shard_cache))
+            start = time.perf_counter()
+            run_query(index_dir, query, shard_cache, meta)
+            warm.append((time.perf_counter() - start) * 1000)
+
+        print(f"Query (shard fetch + parse + match): p50 {percentile(cold, 0.5):.2f} ms, "
+              f"p95 {percentile(cold, 0.95):.2f} ms")
+        print(f"Shard bytes fetched per query:       p50 {percentile(fetched, 0.5) / 1024:.1f} KB, "
+              f"p95 {percentile(fetched, 0.95) / 1024:.1f} KB")
+        print(f"Query (shards already loaded):       p50 {percentile(warm, 0.5):.2f} ms, "
+              f"p95 {percentile(warm, 0.95):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
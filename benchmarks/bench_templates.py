@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for page templating.
+
+Compares the old chained str.replace substitution (plus the eight nav-link
+rewrites for folder-based posts) against the precompiled CompiledTemplate
+on a synthetic corpus of post pages.
+
+Usage: python benchmarks/bench_templates.py [--pages N] [--body-kb K]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from main import CompiledTemplate  # noqa: E402
+
+NAV_REWRITES = [
+    ('href="../blogs.html"', 'href="../../blogs.html"'),
+    ('href="assets/', 'href="../../assets/'),
+    ('href="index.html"', 'href="../../index.html"'),
+    ('href="blogs.html"', 'href="../../blogs.html"'),
+    ('href="writeups.html"', 'href="../../writeups.html"'),
+    ('href="services.html"', 'href="../../services.html"'),
+    ('href="about.html"', 'href="../../about.html"'),
+    ('href="contact.html"', 'href="../../contact.html"'),
+]
+
+
+def make_bodies(pages, body_kb):
+    """Build synthetic post bodies of roughly body_kb kilobytes each"""
+    paragraph = "<p>Stage analysis of the loader, see <code>payload.bin</code> for details.</p>\n"
+    repeats = max(1, (body_kb * 1024) // len(paragraph))
+    return [f"<h1>Post {n}</h1>\n" + paragraph * repeats for n in range(pages)]
+
+
+def legacy_render(base_source, body, title):
+    """The previous approach: one str.replace per variable, then link rewriting"""
+    html = base_source
+    for key, value in (('page_title', title), ('main_content', body)):
+        html = html.replace(f"{{{{{key}}}}}", str(value))
+    for old, new in NAV_REWRITES:
+        html = html.replace(old, new)
+    return html
+
+
+def compiled_render(base_template, body, title):
+    """The current approach: one join with a root prefix variable"""
+    return base_template.render({'page_title': title, 'main_content': body, 'root': "../../"})
+
+
+def run(label, render, bodies):
+    start = time.perf_counter()
+    total_bytes = 0
+    for n, body in enumerate(bodies):
+        total_bytes += len(render(body, f"Post {n}"))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(bodies) / elapsed:>10.0f} pages/sec  "
+          f"({elapsed * 1000:.1f} ms, {total_bytes / 1024 / 1024:.1f} MB rendered)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=2000, help="number of synthetic pages")
+    parser.add_argument('--body-kb', type=int, default=40, help="approximate post body size")
+    args = parser.parse_args()
+
+    base_source = (REPO_ROOT / "templates" / "base.html").read_text(encoding='utf-8')
+    # The legacy path expects the template without root prefix slots
+    legacy_source = base_source.replace("{{root}}", "")
+    bodies = make_bodies(args.pages, args.body_kb)
+
+    start = time.perf_counter()
+    base_template = CompiledTemplate(base_source)
+    compile_ms = (time.perf_counter() - start) * 1000
+    print(f"Compiled base.html into {len(base_template.slots)} slots in {compile_ms:.3f} ms")
+
+    before = run("legacy", lambda body, title: legacy_render(legacy_source, body, title), bodies)
+    after = run("compiled", lambda body, title: compiled_render(base_template, body, title), bodies)
+    print(f"Speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
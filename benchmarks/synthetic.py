@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Synthetic content generator for build benchmarks.
+
+Creates a Blog/ and Writeups/ tree shaped like the real site: front matter,
+prose, fenced code blocks, StartGreenBox...EndGreenBox style boxes and image
+references, plus copies of templates/ and assets/ and a CNAME so the tree
+builds on its own, sitemap and feeds included.
+
+Usage: python benchmarks/synthetic.py OUTPUT_DIR [--posts N] [--writeups N] ...
+"""
+
+import argparse
+import random
+import shutil
+import struct
+import zlib
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+BOX_KINDS = ['Green', 'Red', 'Blue', 'Purple', 'Yellow']
+CATEGORIES = ['Malware Analysis', 'Reverse Engineering', 'DFIR', 'CTF Malware Analysis', 'Web Exploitation']
+TAGS = ['malware-analysis', 'reverse-engineering', 'powershell', 'darkgate', 'ctf', 'dfir',
+        'loader', 'deobfuscation', 'windows', 'lnk', 'jscript', 'hackthebox', 'pe', 'ida']
+WORDS = ("the loader decodes a second stage payload from an encrypted blob and injects it "
+         "into a suspended process while the analyst tracks registry keys network beacons "
+         "and scheduled tasks across the sandbox run").split()
+CODE_SAMPLES = {
+    'powershell': '$s = [System.Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($b))\n'
+                  'Invoke-Expression $s\nStart-Process -FilePath "$env:TEMP\\\\x.exe" -WindowStyle Hidden',
+    'python': 'nums = [666, 672, 661, 673, 654]\n'
+              'decoded = "".join(chr(n - 557) for n in nums)\nprint(decoded)',
+    'javascript': 'var a = "\\x68\\x74\\x74\\x70";\nvar o = new ActiveXObject("WScript.Shell");\n'
+                  'o.Run("mshta " + a, 0, false);',
+    'c': 'int main(void) {\n    HANDLE h = OpenProcess(PROCESS_ALL_ACCESS, FALSE, pid);\n'
+         '    WriteProcessMemory(h, addr, buf, len, NULL);\n    return 0;\n}',
+}
+
+
+def png_bytes(width, height, seed):
+    """A small valid RGB PNG built with the stdlib"""
+    rng = random.Random(seed)
+    rows = b"".join(b"\x00" + bytes(rng.randrange(256) for _ in range(width * 3)) for _ in range(height))
+
+    def chunk(kind, data):
+        body = kind + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(rows, 6)) + chunk(b"IEND", b""))
+
+
+def paragraph(rng, words=60):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def make_post(rng, number, kind, code_blocks, boxes, images, paragraphs):
+    """Markdown source for one synthetic post"""
+    date = f"20{rng.randint(20, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    tags = ", ".join(rng.sample(TAGS, 3))
+    lines = [
+        "---",
+        f"title: Synthetic {kind} {number}: {' '.join(rng.sample(WORDS, 4))}",
+        f"description: {paragraph(rng, 15)}",
+        f"tags: [{tags}]",
+        f"category: {rng.choice(CATEGORIES)}",
+        f"date: {date}",
+        "---",
+        "",
+    ]
+    blocks = []
+    blocks += [paragraph(rng) for _ in range(paragraphs)]
+    for _ in range(code_blocks):
+        language = rng.choice(sorted(CODE_SAMPLES))
+        blocks.append(f"```{language}\n" + "\n".join([CODE_SAMPLES[language]] * rng.randint(1, 6)) + "\n```")
+    for _ in range(boxes):
+        colour = rng.choice(BOX_KINDS)
+        blocks.append(f"Start{colour}Box\n\n**Note:** {paragraph(rng, 20)}\n\nEnd{colour}Box")
+    for index in range(images):
+        blocks.append(f"![image.png](assets%20{number}/image%20{index}.png)")
+    rng.shuffle(blocks)
+    return "\n".join(lines) + "\n\n".join(blocks) + "\n"
+
+
+def generate_tree(output_dir, posts=100, writeups=50, code_blocks=4, boxes=3, images=2,
+                  paragraphs=12, image_size=(320, 180), seed=1):
+    """Create a synthetic site tree in output_dir; returns the number of posts written"""
+    output_dir = Path(output_dir)
+    rng = random.Random(seed)
+    for name in ('templates', 'assets'):
+        target = output_dir / name
+        if target.exists():
+            shutil.rmtree(target)
+        shutil.copytree(REPO_ROOT / name, target)
+    # The sitemap and feeds need an absolute base URL
+    (output_dir / "CNAME").write_text("example.com\n", encoding='utf-8')
+
+    image_data = [png_bytes(*image_size, seed=n) for n in range(max(images, 1))]
+    for content_dir, kind, count in (('Blog', 'blog', posts), ('Writeups', 'writeup', writeups)):
+        for number in range(count):
+            post_dir = output_dir / content_dir / f"{kind}-{number:05d}"
+            post_dir.mkdir(parents=True, exist_ok=True)
+            source = make_post(rng, number, kind, code_blocks, boxes, images, paragraphs)
+            (post_dir / "index.md").write_text(source, encoding='utf-8')
+            if images:
+                assets_dir = post_dir / f"assets {number}"
+                assets_dir.mkdir(exist_ok=True)
+                for index in range(images):
+                    (assets_dir / f"image {index}.png").write_bytes(image_data[index % len(image_data)])
+    return posts + writeups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('output_dir')
+    parser.add_argument('--posts', type=int, default=100, help="blog posts to generate")
+    parser.add_argument('--writeups', type=int, default=50, help="writeups to generate")
+    parser.add_argument('--code-blocks', type=int, default=4, help="fenced code blocks per post")
+    parser.add_argument('--boxes', type=int, default=3, help="Start*Box...End*Box blocks per post")
+    parser.add_argument('--images', type=int, default=2, help="image references per post")
+    parser.add_argument('--paragraphs', type=int, default=12, help="prose paragraphs per post")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    count = generate_tree(args.output_dir, args.posts, args.writeups, args.code_blocks,
+                          args.boxes, args.images, args.paragraphs, seed=args.seed)
+    print(f"Generated {count} posts in {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,513 +4,2051 @@ NYX Cybersecurity Portfolio Website Generator
 Dynamically generates HTML files from Blog and Writeups folders
 """
 
+import time
+# Startup cost of this module, printed with --profile
+MODULE_LOAD_START = time.perf_counter()
+
 import os
 import glob
-import markdown
+import html
 import re
+import argparse
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
+from functools import partial
+from importlib.util import find_spec
+from itertools import chain, islice
 from pathlib import Path
+from urllib.parse import quote, unquote
 import json
-try:
-    from pygments import highlight
-    from pygments.lexers import get_lexer_by_name, guess_lexer
-    from pygments.formatters import HtmlFormatter
-    from pygments.util import ClassNotFound
-    PYGMENTS_AVAILABLE = True
-except ImportError:
+
+from nyx_cache import BuildCache, HighlightCache
+from nyx_files import PRECOMPRESS_ENCODINGS, StreamingFileWriter, copy_if_changed, file_sha256, write_if_changed
+
+# Heavy optional dependencies are imported by the stage that needs them, and
+# each optional pipeline (nyx_*.py) only by the flag that enables it
+PYGMENTS_AVAILABLE = find_spec('pygments') is not None
+if not PYGMENTS_AVAILABLE:
     print("Warning: Pygments not available. Code highlighting disabled.")
-    PYGMENTS_AVAILABLE = False
 
-class PortfolioGenerator:
+CACHE_DIR_NAME = ".nyx-cache"
+
+
+# Shared no-op context handed out when --profile is off
+NULL_STAGE = nullcontext()
+
+
+class NullProfiler:
+    """Stands in for nyx_profile.BuildProfiler without --profile; every stage is a no-op"""
+
+    enabled = False
+
     def __init__(self):
+        self.events = []
+
+    def stage(self, name, file=None):
+        return NULL_STAGE
+
+    def drain(self):
+        return []
+
+
+# The sitemaps.org limit on URLs per sitemap file
+SITEMAP_MAX_URLS = 50000
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+FEED_MAX_ENTRIES = 50
+FEED_AUTHOR = "Geetansh Aditya"
+FEED_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+# Local references in generated HTML and CSS that pull files into the output
+LOCAL_REFERENCE_RE = re.compile(r'''\b(?:href|src|srcset|poster)="([^"]*)"|url\((['"]?)([^'")]+)\2\)''')
+# Files copied into a separate output directory even though no page links them
+PASSTHROUGH_FILES = ('CNAME', '.nojekyll')
+MANIFEST_NAME = ".nyx-manifest.json"
+MANIFEST_DIFF_NAME = ".nyx-manifest-diff.json"
+# Default --code-fragment-kb; 0 leaves every code block inline
+CODE_FRAGMENT_KB = 16
+# Main content bytes considered "above the fold" when picking critical CSS
+CRITICAL_CONTENT_BYTES = 4096
+
+
+HTML_TAG_RE = re.compile(r'<[^<]+?>')
+EXCERPT_LENGTH = 150
+# Newest blog posts and writeups shown on the home page
+HOME_PAGE_POSTS = 3
+DEFAULT_PAGE_TITLE = "Geetansh Aditya | Cybersecurity Specialist - Reverse Engineering & DFIR"
+
+
+def make_excerpt(html_content, length=EXCERPT_LENGTH):
+    """First `length` characters of text in html_content, with tags stripped.
+
+    Gives the same result as stripping tags from the whole document, but only
+    scans as much of it as the excerpt needs.
+    """
+    chunk_size = max(length * 8, 2048)
+    while chunk_size < len(html_content):
+        head = html_content[:chunk_size]
+        # Never cut through a tag: drop a trailing unterminated '<...'
+        last_open = head.rfind('<')
+        if last_open != -1 and head.find('>', last_open) == -1:
+            head = head[:last_open]
+        text = HTML_TAG_RE.sub('', head)
+        if len(text) >= length:
+            return text[:length] + "..."
+        chunk_size *= 4
+    return HTML_TAG_RE.sub('', html_content)[:length] + "..."
+
+
+def parse_tags(values):
+    """Split `tags: [a, b]` front matter, which Meta returns as one string, into tags"""
+    tags = []
+    for value in values:
+        value = value.strip()
+        if value.startswith('[') and value.endswith(']'):
+            tags.extend(tag.strip().strip('"\'') for tag in value[1:-1].split(','))
+        else:
+            tags.append(value)
+    return [tag for tag in tags if tag]
+
+
+# Front matter syntax, as recognised by markdown's meta extension
+META_BEGIN_RE = re.compile(r'^-{3}(\s.*)?')
+META_END_RE = re.compile(r'^(-{3}|\.{3})(\s.*)?')
+META_LINE_RE = re.compile(r'^[ ]{0,3}(?P<key>[A-Za-z0-9_-]+):\s*(?P<value>.*)')
+META_MORE_RE = re.compile(r'^[ ]{4,}(?P<value>.*)')
+
+
+def read_front_matter(file_path):
+    """Parse only the front matter at the top of a markdown file.
+
+    Follows the rules of the meta extension, so the result equals Markdown.Meta
+    for the same file, but stops reading at the end of the header.
+    """
+    metadata = {}
+    key = None
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f):
+            line = line.rstrip('\r\n').expandtabs(4)
+            if number == 0 and META_BEGIN_RE.match(line):
+                continue
+            if line.strip() == '' or META_END_RE.match(line):
+                break
+            match = META_LINE_RE.match(line)
+            if match:
+                key = match.group('key').lower().strip()
+                metadata.setdefault(key, []).append(match.group('value').strip())
+                continue
+            match = META_MORE_RE.match(line)
+            if not (match and key):
+                break
+            metadata[key].append(match.group('value').strip())
+    return metadata
+
+
+class PostRecord:
+    """Listing data for one post; the rendered body is loaded on demand and never kept.
+
+    `content` renders the post (or loads it from the build cache) each time it is
+    read, so callers should hold on to the result only while they need it.
+    """
+
+    __slots__ = ('title', 'description', 'tags', 'category', 'date', 'excerpt', 'kind',
+                 'filename', 'file_path', 'folder_path', 'cards', 'links', 'loader')
+
+    def __init__(self, loader, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+        self.loader = loader
+        self.excerpt = self.excerpt or ""
+        self.cards = {}
+
+    @property
+    def content(self):
+        return self.loader(self)
+
+
+def slugify(text):
+    """URL-safe slug for tag and category archive pages"""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+# Archives and later listing pages live under one directory that cannot clash,
+# even on case-insensitive filesystems, with the Blog/ and Writeups/ sources
+ARCHIVE_DIR = "archive"
+
+
+def root_prefix(relative_url):
+    """Relative prefix from a page at relative_url back to the site root"""
+    return "../" * relative_url.count('/')
+
+
+TEMPLATE_VARIABLE_RE = re.compile(r'\{\{(\w+)\}\}')
+
+
+class CompiledTemplate:
+    """HTML template pre-split into literal segments and {{variable}} slots"""
+
+    def __init__(self, source):
+        # Literal text sits at even indexes and variable names at odd indexes
+        self.segments = TEMPLATE_VARIABLE_RE.split(source)
+        self.slots = [(index, self.segments[index])
+                      for index in range(1, len(self.segments), 2)]
+
+    def render(self, variables):
+        """Fill every slot in one pass; unknown variables are left in place"""
+        parts = list(self.segments)
+        for index, name in self.slots:
+            if name in variables:
+                parts[index] = str(variables[name])
+            else:
+                parts[index] = f"{{{{{name}}}}}"
+        return "".join(parts)
+
+
+LIVE_RELOAD_SCRIPT = '''
+<script>
+// Injected by `main.py serve`: reload when the generator finishes a rebuild
+(function() {
+    let build = null;
+    setInterval(function() {
+        fetch('/__nyx/build', {cache: 'no-store'})
+            .then(function(response) { return response.text(); })
+            .then(function(current) {
+                if (build !== null && current !== build) {
+                    location.reload();
+                }
+                build = current;
+            })
+            .catch(function() {});
+    }, 1000);
+})();
+</script>
+'''
+
+
+def live_reload_handler(generator):
+    """Static file handler class for serve; http.server is only imported when serving"""
+    from http.server import SimpleHTTPRequestHandler
+
+    class LiveReloadHandler(SimpleHTTPRequestHandler):
+        """Static file handler that injects the live reload script into HTML pages"""
+
+        generator = None
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] == '/__nyx/build':
+                self.send_text(str(self.generator.build_id), 'text/plain')
+                return
+            
+            file_path = Path(self.translate_path(self.path))
+            if file_path.is_dir():
+                file_path = file_path / "index.html"
+            if file_path.suffix == '.html' and file_path.is_file():
+                html_content = file_path.read_text(encoding='utf-8')
+                html_content = html_content.replace('</body>', LIVE_RELOAD_SCRIPT + '</body>', 1)
+                self.send_text(html_content, 'text/html')
+                return
+            super().do_GET()
+
+        def send_text(self, text, content_type):
+            body = text.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Keep the console for rebuild reports
+            pass
+
+    # The handler reads the current build id from the generator
+    LiveReloadHandler.generator = generator
+    return LiveReloadHandler
+
+
+# Per-process generator used by parallel render workers
+_worker_generator = None
+
+
+def _init_render_worker(highlight_cache, profile=False):
+    """Give each worker process its own generator and markdown instance"""
+    global _worker_generator
+    # Workers only render markdown, so none of the page pipelines are loaded
+    _worker_generator = PortfolioGenerator(use_cache=False, jobs=1,
+                                           highlight_cache=highlight_cache,
+                                           profile=profile, optimize_images=False,
+                                           search_index=False, asset_pipeline=False,
+                                           compress=False, code_fragment_kb=0,
+                                           related_posts=False)
+
+
+def _render_worker(job):
+    """Render one (file_path, source) job inside a worker process.
+
+    Returns (result, error, (highlight hits, highlight misses), profile events).
+    """
+    cache = _worker_generator.highlight_cache
+    hits, misses = cache.hits, cache.misses
+    result, error = _worker_generator.render_job(job)
+    return (result, error, (cache.hits - hits, cache.misses - misses),
+            _worker_generator.profiler.drain())
+
+
+class PortfolioGenerator:
+    def __init__(self, use_cache=True, jobs=None, highlight_cache=True,
+                 highlight_cache_bytes=64 * 1024 * 1024, optimize_images=True,
+                 search_index=True, page_size=12, profile=False, asset_pipeline=True,
+                 self_host_fonts=False, compress=True, output_dir=None, highlight_inline=False,
+                 code_fragment_kb=CODE_FRAGMENT_KB, related_posts=True, base_url=None):
         self.base_dir = Path(".")
         self.blog_dir = self.base_dir / "Blog"
         self.writeups_dir = self.base_dir / "Writeups"
         self.templates_dir = self.base_dir / "templates"
-        self.output_dir = self.base_dir
+        # Pages are written next to their sources unless a separate output directory is given
+        self.output_dir = Path(output_dir) if output_dir else self.base_dir
+        self.staged = self.output_dir.resolve() != self.base_dir.resolve()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.page_paths = set()
         
         # Ensure directories exist
         self.blog_dir.mkdir(exist_ok=True)
         self.writeups_dir.mkdir(exist_ok=True)
         
+        # Generated stylesheets, fonts and code fragments
+        self.build_dir = self.output_dir / "assets" / "_build"
+        
+        # Fingerprinted stylesheet and critical CSS; base.html is rewritten to use them
+        self.assets = None
+        if asset_pipeline:
+            from nyx_assets import AssetPipeline
+            self.assets = AssetPipeline(self.base_dir, self.output_dir, self.base_dir / CACHE_DIR_NAME,
+                                        self_host_fonts=self_host_fonts)
+        
+        # Compile templates once at startup
+        self.templates = self.compile_templates()
+        
         # Initialize markdown processor with enhanced extensions
         extensions = ['meta', 'toc', 'fenced_code', 'tables', 'nl2br']
         extension_configs = {}
         
+        # Token colors for code blocks, linked only from pages that contain code
+        self.highlight_css = None
         if PYGMENTS_AVAILABLE:
+            from nyx_highlight import HIGHLIGHT_STYLE, HighlightStylesheet
+            self.highlight_css = HighlightStylesheet(self.build_dir, self.base_dir / CACHE_DIR_NAME,
+                                                     inline=highlight_inline)
             extensions.append('codehilite')
             extension_configs['codehilite'] = {
                 'css_class': 'highlight',
                 'use_pygments': True,
-                'noclasses': False
+                'noclasses': False,
+                'pygments_style': HIGHLIGHT_STYLE
             }
         
-        self.md = markdown.Markdown(extensions=extensions, extension_configs=extension_configs)
+        # Code blocks above the threshold are served as fragments loaded on demand
+        self.code_fragments = None
+        if code_fragment_kb > 0:
+            from nyx_fragments import CodeFragments
+            self.code_fragments = CodeFragments(self.build_dir, threshold_bytes=code_fragment_kb * 1024)
         
-        # Initialize Pygments formatter for syntax highlighting if available
-        self.code_formatter = None
-        if PYGMENTS_AVAILABLE:
-            from pygments.formatters import HtmlFormatter
-            self.code_formatter = HtmlFormatter(
-                style='monokai',
-                cssclass='highlight',
-                noclasses=False
-            )
+        # markdown and Pygments are only imported once a post has to be rendered
+        self.markdown_config = (extensions, extension_configs)
+        self.md = None
+        self.custom_boxes = None
+        
+        # Build cache for parsed posts; the fingerprint invalidates entries
+        # whenever the markdown configuration changes
+        self.cache = BuildCache(self.base_dir / CACHE_DIR_NAME, enabled=use_cache)
+        self.config_fingerprint = json.dumps(
+            {'extensions': extensions, 'extension_configs': extension_configs},
+            sort_keys=True
+        )
+        
+        # Highlighted code blocks are cached separately so unchanged snippets in
+        # edited posts, and snippets repeated across posts, skip Pygments
+        self.highlight_cache = HighlightCache(self.base_dir / CACHE_DIR_NAME,
+                                              enabled=highlight_cache,
+                                              max_bytes=highlight_cache_bytes)
+        
+        # Stage timers for --profile; without it every stage is a no-op context manager
+        self.profiler = NullProfiler()
+        if profile:
+            from nyx_profile import BuildProfiler
+            self.profiler = BuildProfiler()
+        
+        # Responsive variants for images referenced from post pages
+        self.image_optimizer = None
+        if optimize_images:
+            from nyx_images import ImageOptimizer
+            self.image_optimizer = ImageOptimizer(self.base_dir / CACHE_DIR_NAME)
+        
+        # Client-side search index; per-post term weights are cached by content
+        self.search_indexer = None
+        if search_index:
+            from nyx_search import SearchIndexer
+            self.search_indexer = SearchIndexer(self.base_dir / CACHE_DIR_NAME, use_cache=use_cache)
+        
+        # Related-post links on post pages; term vectors are cached by content
+        self.related_posts = None
+        if related_posts:
+            from nyx_related import RelatedPosts
+            self.related_posts = RelatedPosts(self.base_dir / CACHE_DIR_NAME, use_cache=use_cache)
+        # Prev/next and related links of every page, for builds that only write some pages
+        self.use_cache = use_cache
+        self.links_path = self.base_dir / CACHE_DIR_NAME / "related" / "links.json"
+        
+        self.parsed_count = 0
+        self.cached_count = 0
+        self.used_cache_keys = set()
+        
+        # Posts per page on paginated listings and archives
+        self.page_size = max(1, page_size)
+        # (section, tag or category name) -> archive slug, set once every post is known
+        self.archive_slugs = {}
+        
+        # Number of worker processes used to render posts that missed the cache
+        self.jobs = jobs or os.cpu_count() or 1
+        self.render_pool = None
+        
+        # Absolute URLs in the sitemap and feeds; without --base-url the CNAME domain is used
+        self.base_url = (base_url or self.cname_base_url() or "").rstrip('/')
+        
+        # Sitemap and feed dates follow content changes, not checkout times; neither
+        # is written without a base URL
+        self.lastmod = None
+        if self.base_url:
+            from nyx_lastmod import LastModified
+            self.lastmod = LastModified(self.base_dir, self.base_dir / CACHE_DIR_NAME, use_cache=use_cache)
+        
+        # .gz/.br siblings for text outputs, skipped for files unchanged since the last build
+        self.precompressor = None
+        if compress:
+            from nyx_compress import Precompressor
+            self.precompressor = Precompressor(self.base_dir / CACHE_DIR_NAME, self.output_dir, jobs=self.jobs)
+        
+        # Incremented after every rebuild in serve mode to trigger live reload
+        self.build_id = 0
     
-    def process_custom_boxes(self, content):
-        """Process custom info boxes in markdown content"""
-        box_patterns = {
-            'StartGreenBox': ('success-box', 'EndGreenBox'),
-            'StartRedBox': ('danger-box', 'EndRedBox'),
-            'StartBlueBox': ('info-box', 'EndBlueBox'),
-            'StartPurpleBox': ('note-box', 'EndPurpleBox'),
-            'StartYellowBox': ('warning-box', 'EndYellowBox')
-        }
+    def cname_base_url(self):
+        """https:// URL of the custom domain in the CNAME file, if there is one"""
+        try:
+            domain = (self.base_dir / "CNAME").read_text(encoding='utf-8').strip()
+        except OSError:
+            return None
+        return f"https://{domain}" if domain else None
+    
+    def get_markdown(self):
+        """Return the markdown processor, importing markdown and Pygments on first use"""
+        if self.md is None:
+            with self.profiler.stage('import markdown'):
+                import nyx_markdown
+            # Highlighted code blocks go through the shared cache and profiler
+            nyx_markdown.CachedCodeHilite.cache = self.highlight_cache
+            nyx_markdown.CachedCodeHilite.profiler = self.profiler
+            self.md, self.custom_boxes = nyx_markdown.create_markdown(*self.markdown_config)
+        return self.md
+    
+    def render_markdown(self, content):
+        """Convert markdown source to HTML and return (metadata, html)"""
+        md = self.get_markdown()
+        # Reset markdown processor
+        with self.profiler.stage('markdown'):
+            md.reset()
+            html_content = md.convert(content)
         
-        processed_content = content
+        # Extract metadata
+        metadata = getattr(md, 'Meta', {})
+        return metadata, html_content
+
+    def build_post_data(self, file_path, metadata):
+        """Assemble the post record from parsed front matter"""
+        # Get file stats
+        stat = os.stat(file_path)
+        created_date = datetime.fromtimestamp(stat.st_ctime)
         
-        for start_tag, (css_class, end_tag) in box_patterns.items():
-            pattern = f"{start_tag}(.*?){end_tag}"
-            def replace_box(match):
-                box_content = match.group(1).strip()
-                return f'<div class="{css_class}">{box_content}</div>'
-            
-            processed_content = re.sub(pattern, replace_box, processed_content, flags=re.DOTALL)
+        # Determine if this is a folder-based post
+        folder_name = Path(file_path).parent.name
+        if folder_name in ['Blog', 'Writeups']:
+            # This is a root-level file, use filename
+            slug = Path(file_path).stem
+        else:
+            # This is a folder-based post, use folder name
+            slug = folder_name
         
-        return processed_content
+        return PostRecord(
+            self.load_post_content,
+            title=metadata.get('title', [Path(file_path).stem.replace('-', ' ').title()])[0],
+            description=metadata.get('description', [''])[0],
+            tags=parse_tags(metadata.get('tags', [])),
+            category=metadata.get('category', ['General'])[0],
+            date=metadata.get('date', [created_date.strftime('%Y-%m-%d')])[0],
+            kind='writeup' if self.writeups_dir in Path(file_path).parents else 'blog',
+            filename=slug,
+            file_path=str(file_path),
+            folder_path=str(Path(file_path).parent)
+        )
 
-    def parse_markdown_file(self, file_path):
-        """Parse markdown file and extract metadata"""
+    def scan_post(self, file_path):
+        """Read a post's front matter into a record without rendering its body"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Process custom info boxes before markdown conversion
-            content = self.process_custom_boxes(content)
-            
-            # Reset markdown processor
-            self.md.reset()
-            html_content = self.md.convert(content)
-            
-            # Extract metadata
-            metadata = getattr(self.md, 'Meta', {})
-            
-            # Get file stats
-            stat = os.stat(file_path)
-            created_date = datetime.fromtimestamp(stat.st_ctime)
-            modified_date = datetime.fromtimestamp(stat.st_mtime)
+            with self.profiler.stage('front matter', file_path):
+                return self.build_post_data(file_path, read_front_matter(file_path))
+        except Exception as e:
+            print(f"Error parsing {file_path}: {e}")
+            return None
+
+    def load_post_content(self, post):
+        """Rendered HTML of one post, from the build cache or rendered now"""
+        for _, html_content in self.iter_post_contents([post]):
+            return html_content
+        return None
+
+    def read_cache_key(self, file_path):
+        """Read a post's source and return (source bytes, build cache key)"""
+        with self.profiler.stage('read', file_path):
+            with open(file_path, 'rb') as f:
+                source = f.read()
+        with self.profiler.stage('cache lookup', file_path):
+            cache_key = self.cache.make_key(source, self.config_fingerprint)
+            self.used_cache_keys.add(cache_key)
+        return source, cache_key
+
+    def load_excerpts(self, posts):
+        """Fill in post excerpts from the build cache, rendering only posts it misses.
+
+        Returns the posts that have an excerpt; posts that fail to render are
+        reported and left out.
+        """
+        misses = []
+        for post in posts:
+            try:
+                _, cache_key = self.read_cache_key(post.file_path)
+                excerpt = self.cache.load_excerpt(cache_key)
+            except Exception as e:
+                print(f"Error parsing {post.file_path}: {e}")
+                continue
+            if excerpt is None:
+                misses.append(post)
+            else:
+                post.excerpt = excerpt
+                self.cached_count += 1
+        rendered = {post.file_path for post, _ in self.iter_post_contents(misses)}
+        return [post for post in posts if post not in misses or post.file_path in rendered]
+
+    def iter_post_contents(self, posts):
+        """Yield (post, html) in order, rendering cache misses in parallel a window at a time.
+
+        Each yielded post also gets its listing excerpt. Only one window of
+        bodies is held at once, so memory does not grow with the number of
+        posts. Posts that fail to render are reported and skipped.
+        """
+        window = self.jobs * 4
+        for start in range(0, len(posts), window):
+            batch = posts[start:start + window]
+            contents = [None] * len(batch)
+            pending = []
+            for index, post in enumerate(batch):
+                file_path = post.file_path
+                try:
+                    # Unchanged posts are served straight from the build cache
+                    source, cache_key = self.read_cache_key(file_path)
+                    with self.profiler.stage('cache lookup', file_path):
+                        cached = self.cache.load(cache_key)
+                    if cached:
+                        _, contents[index], post.excerpt = cached
+                        self.cached_count += 1
+                    else:
+                        pending.append((index, file_path, cache_key, source))
+                except Exception as e:
+                    print(f"Error parsing {file_path}: {e}")
             
-            # Determine if this is a folder-based post
-            folder_name = Path(file_path).parent.name
-            if folder_name in ['Blog', 'Writeups']:
-                # This is a root-level file, use filename
-                slug = Path(file_path).stem
+            # Render cache misses, fanning out to worker processes when worthwhile
+            jobs = [(file_path, source) for _, file_path, _, source in pending]
+            if self.jobs > 1 and len(pending) > 1:
+                rendered = self.collect_worker_results(self.get_render_pool().map(_render_worker, jobs))
             else:
-                # This is a folder-based post, use folder name
-                slug = folder_name
+                rendered = (self.render_job(job) for job in jobs)
             
-            return {
-                'title': metadata.get('title', [Path(file_path).stem.replace('-', ' ').title()])[0],
-                'description': metadata.get('description', [''])[0],
-                'tags': metadata.get('tags', []),
-                'category': metadata.get('category', ['General'])[0],
-                'date': metadata.get('date', [created_date.strftime('%Y-%m-%d')])[0],
-                'content': html_content,
-                'filename': slug,
-                'file_path': str(file_path),
-                'folder_path': str(Path(file_path).parent)
-            }
+            for (index, file_path, cache_key, _), (result, error) in zip(pending, rendered):
+                if error is not None:
+                    print(f"Error parsing {file_path}: {error}")
+                    continue
+                try:
+                    metadata, html_content = result
+                    excerpt = make_excerpt(html_content)
+                    with self.profiler.stage('cache store', file_path):
+                        self.cache.store(cache_key, metadata, html_content, excerpt)
+                    contents[index] = html_content
+                    batch[index].excerpt = excerpt
+                    self.parsed_count += 1
+                except Exception as e:
+                    print(f"Error parsing {file_path}: {e}")
+            
+            for post, html_content in zip(batch, contents):
+                if html_content is not None:
+                    yield post, html_content
+
+    def render_job(self, job):
+        """Render one (file_path, source) job, returning (result, error message)"""
+        file_path, source = job
+        try:
+            with self.profiler.stage('render', file_path):
+                result = self.render_markdown(source.decode('utf-8'))
+            for warning in self.custom_boxes.warnings:
+                print(f"Warning: {file_path}: {warning}")
+            return result, None
         except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
-            return None
-    
-    def get_blog_posts(self):
-        """Get all blog posts from Blog directory (including folder-based posts)"""
-        blogs = []
-        
-        # Get direct markdown files in Blog directory
-        blog_files = glob.glob(str(self.blog_dir / "*.md"))
-        for file_path in blog_files:
-            blog_data = self.parse_markdown_file(file_path)
-            if blog_data:
-                blogs.append(blog_data)
-        
-        # Get folder-based blog posts (look for index.md in subdirectories)
-        blog_folders = [d for d in self.blog_dir.iterdir() if d.is_dir()]
-        for folder in blog_folders:
+            # Errors travel back from worker processes as plain strings
+            return None, str(e)
+
+    def collect_worker_results(self, results):
+        """Fold worker highlight-cache counters and profile events into ours and yield (result, error)"""
+        for result, error, (hits, misses), events in results:
+            self.highlight_cache.hits += hits
+            self.highlight_cache.misses += misses
+            self.profiler.events.extend(events)
+            yield result, error
+
+    def get_render_pool(self):
+        """Return the process pool used for parallel rendering"""
+        if self.render_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self.render_pool = ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_render_worker,
+                initargs=(self.highlight_cache.enabled, self.profiler.enabled)
+            )
+        return self.render_pool
+
+    def close(self):
+        """Shut down worker processes started by the build"""
+        if self.render_pool is not None:
+            self.render_pool.shutdown()
+            self.render_pool = None
+
+    def collect_post_files(self, content_dir):
+        """List direct markdown files and folder-based index.md files in a content directory"""
+        # Get direct markdown files in the content directory
+        post_files = glob.glob(str(content_dir / "*.md"))
+        
+        # Get folder-based posts (look for index.md in subdirectories)
+        post_folders = [d for d in content_dir.iterdir() if d.is_dir()]
+        for folder in post_folders:
             index_file = folder / "index.md"
             if index_file.exists():
-                blog_data = self.parse_markdown_file(str(index_file))
-                if blog_data:
-                    blogs.append(blog_data)
+                post_files.append(str(index_file))
+        
+        return post_files
+    
+    def scan_posts(self, content_dir):
+        """Records for every post in a content directory, newest first"""
+        posts = [post for post in map(self.scan_post, self.collect_post_files(content_dir)) if post]
         
         # Sort by date (newest first)
-        blogs.sort(key=lambda x: x['date'], reverse=True)
-        return blogs
+        posts.sort(key=lambda x: x.date, reverse=True)
+        return posts
+    
+    def get_blog_posts(self):
+        """Get all blog posts from Blog directory (including folder-based posts)"""
+        return self.scan_posts(self.blog_dir)
     
     def get_writeups(self):
         """Get all CTF writeups from Writeups directory (including folder-based writeups)"""
-        writeups = []
-        
-        # Get direct markdown files in Writeups directory
-        writeup_files = glob.glob(str(self.writeups_dir / "*.md"))
-        for file_path in writeup_files:
-            writeup_data = self.parse_markdown_file(file_path)
-            if writeup_data:
-                writeups.append(writeup_data)
-        
-        # Get folder-based writeups (look for index.md in subdirectories)
-        writeup_folders = [d for d in self.writeups_dir.iterdir() if d.is_dir()]
-        for folder in writeup_folders:
-            index_file = folder / "index.md"
-            if index_file.exists():
-                writeup_data = self.parse_markdown_file(str(index_file))
-                if writeup_data:
-                    writeups.append(writeup_data)
-        
-        # Sort by date (newest first)
-        writeups.sort(key=lambda x: x['date'], reverse=True)
-        return writeups
+        return self.scan_posts(self.writeups_dir)
     
-    def load_template(self, template_name):
-        """Load HTML template"""
-        template_path = self.templates_dir / template_name
-        try:
+    def compile_templates(self):
+        """Compile every HTML template once so pages render with a single join"""
+        templates = {}
+        for template_path in sorted(self.templates_dir.glob("*.html")):
             with open(template_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except FileNotFoundError:
+                source = f.read()
+            if template_path.name == 'base.html':
+                if self.assets:
+                    source = self.assets.rewrite_head(source)
+                # Everything before the main content is above the fold on every page
+                self.base_above_fold = source.split('{{main_content}}', 1)[0]
+            templates[template_path.name] = CompiledTemplate(source)
+        return templates
+
+    def render_base(self, base_template, variables, output_path):
+        """Render base.html, inlining the page's critical CSS when the asset pipeline is on"""
+        if self.assets and self.assets.ready:
+            above_fold = self.base_above_fold + variables['main_content'][:CRITICAL_CONTENT_BYTES]
+            variables['critical_css'] = self.assets.critical_css(above_fold, variables['root'])
+            self.assets.record_page(output_path, variables['critical_css'])
+        variables.setdefault('page_head', '')
+        return base_template.render(variables)
+
+    def load_template(self, template_name):
+        """Load a compiled HTML template"""
+        template = self.templates.get(template_name)
+        if template is None:
             print(f"Template {template_name} not found")
-            return ""
+        return template
     
     def replace_template_variables(self, template_content, variables):
         """Replace template variables with actual content"""
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            template_content = template_content.replace(placeholder, str(value))
-        return template_content
+        return CompiledTemplate(template_content).render(variables)
     
-    def generate_blog_cards(self, blogs, limit=None):
-        """Generate HTML cards for blog posts"""
-        if limit:
-            blogs = blogs[:limit]
+    def tags_html(self, post, root):
+        """Tag links pointing at the per-tag archive pages"""
+        return " ".join([f'<a href="{root}{self.archive_url("tags", tag)}" class="tag">{tag}</a>'
+                         for tag in post.tags])
+
+    def assign_archive_slugs(self, posts):
+        """Give every tag and category a unique archive slug.
+
+        Names that differ only in case share an archive. Other names whose slugs
+        collide (e.g. "C" and "C++") get -2, -3, ... suffixes in name order.
+        """
+        groups = {}
+        for post in posts:
+            for section, name in [('tags', tag) for tag in post.tags] + [('categories', post.category)]:
+                groups.setdefault((section, slugify(name)), set()).add(name)
+        taken = set(groups)
+        self.archive_slugs = {}
+        for (section, slug), names in sorted(groups.items()):
+            if not slug:
+                continue
+            variants = sorted({name.lower() for name in names})
+            for index, variant in enumerate(variants):
+                unique = slug
+                suffix = index + 1
+                while index and (section, unique) in taken:
+                    unique = f"{slug}-{suffix}"
+                    suffix += 1
+                taken.add((section, unique))
+                for name in names:
+                    if name.lower() == variant:
+                        self.archive_slugs[(section, name)] = unique
+            if len(variants) > 1:
+                print(f"Warning: {section} {', '.join(sorted(names))} share the slug '{slug}'; "
+                      f"archives: {', '.join(sorted(set(self.archive_slugs[(section, name)] for name in names)))}")
+
+    def archive_url(self, section, name):
+        """URL of the first archive page for a tag or category"""
+        # Partial builds that never saw every post fall back to the plain slug
+        slug = self.archive_slugs.get((section, name)) or slugify(name)
+        return f"{ARCHIVE_DIR}/{section}/{slug}.html"
+
+    def post_card(self, post, root=""):
+        """HTML card for a post, built once per post and root prefix and then reused"""
+        cards = post.cards
+        if root in cards:
+            return cards[root]
         
-        cards_html = ""
-        for blog in blogs:
-            # Extract first 150 characters for excerpt
-            excerpt = re.sub('<[^<]+?>', '', blog['content'])[:150] + "..."
-            
-            tags_html = " ".join([f'<span class="tag">{tag}</span>' for tag in blog['tags']])
-            
-            # Determine the correct link path
-            blog_folder_path = Path(blog['folder_path'])
-            if blog_folder_path.name in ['Blog', 'Writeups']:
-                # Root level blog
-                link_path = f"{blog['filename']}.html"
-            else:
-                # Folder-based blog
-                link_path = f"Blog/{blog_folder_path.name}/{blog['filename']}.html"
-            
-            cards_html += f'''
+        link_path = f"{root}{self.post_url(post)}"
+        tags_html = self.tags_html(post, root)
+        if post.kind == 'writeup':
+            cards[root] = f'''
             <article class="content-card">
-                <h3><a href="{link_path}">{blog['title']}</a></h3>
-                <p class="excerpt">{excerpt}</p>
+                <h3><a href="{link_path}">{post.title}</a></h3>
+                <p class="excerpt">{post.excerpt}</p>
                 <div class="meta">
-                    <span class="date">{blog['date']}</span>
+                    <span class="date">{post.date}</span>
+                    <a href="{root}{self.archive_url("categories", post.category)}" class="category">{post.category}</a>
                     <div class="tags">{tags_html}</div>
                 </div>
-                <a href="{link_path}" class="read-more-btn">Read More</a>
+                <a href="{link_path}" class="read-more-btn">Read Writeup</a>
             </article>
             '''
-        
-        return cards_html
-    
-    def generate_writeup_cards(self, writeups, limit=None):
-        """Generate HTML cards for CTF writeups"""
-        if limit:
-            writeups = writeups[:limit]
-        
-        cards_html = ""
-        for writeup in writeups:
-            excerpt = re.sub('<[^<]+?>', '', writeup['content'])[:150] + "..."
-            tags_html = " ".join([f'<span class="tag">{tag}</span>' for tag in writeup['tags']])
-            
-            # Determine the correct link path
-            writeup_folder_path = Path(writeup['folder_path'])
-            if writeup_folder_path.name in ['Blog', 'Writeups']:
-                # Root level writeup
-                link_path = f"{writeup['filename']}.html"
-            else:
-                # Folder-based writeup
-                link_path = f"Writeups/{writeup_folder_path.name}/{writeup['filename']}.html"
-            
-            cards_html += f'''
+        else:
+            cards[root] = f'''
             <article class="content-card">
-                <h3><a href="{link_path}">{writeup['title']}</a></h3>
-                <p class="excerpt">{excerpt}</p>
+                <h3><a href="{link_path}">{post.title}</a></h3>
+                <p class="excerpt">{post.excerpt}</p>
                 <div class="meta">
-                    <span class="date">{writeup['date']}</span>
-                    <span class="category">{writeup['category']}</span>
+                    <span class="date">{post.date}</span>
                     <div class="tags">{tags_html}</div>
                 </div>
-                <a href="{link_path}" class="read-more-btn">Read Writeup</a>
+                <a href="{link_path}" class="read-more-btn">Read More</a>
             </article>
             '''
+        return cards[root]
+
+    def generate_blog_cards(self, blogs, limit=None, root=""):
+        """Generate HTML cards for blog posts"""
+        if limit:
+            blogs = blogs[:limit]
+        return "".join(self.post_card(blog, root) for blog in blogs)
+    
+    def generate_writeup_cards(self, writeups, limit=None, root=""):
+        """Generate HTML cards for CTF writeups"""
+        if limit:
+            writeups = writeups[:limit]
+        return "".join(self.post_card(writeup, root) for writeup in writeups)
+
+    def paginate(self, posts):
+        """Split posts into pages of page_size; always returns at least one page"""
+        return [posts[i:i + self.page_size] for i in range(0, len(posts), self.page_size)] or [[]]
+
+    def listing_page_url(self, first_page_url, number):
+        """URL of page `number` of a listing whose first page is first_page_url"""
+        if number == 1:
+            return first_page_url
+        stem = first_page_url[:-len('.html')]
+        if not stem.startswith(f"{ARCHIVE_DIR}/"):
+            stem = f"{ARCHIVE_DIR}/{stem}"
+        return f"{stem}/page/{number}.html"
+
+    def pagination_html(self, first_page_url, number, page_count, root):
+        """Newer/older navigation for a paginated listing"""
+        if page_count <= 1:
+            return ""
+        links = []
+        if number > 1:
+            newer = self.listing_page_url(first_page_url, number - 1)
+            links.append(f'<a href="{root}{newer}" class="page-link">← Newer</a>')
+        links.append(f'<span class="page-status">Page {number} of {page_count}</span>')
+        if number < page_count:
+            older = self.listing_page_url(first_page_url, number + 1)
+            links.append(f'<a href="{root}{older}" class="page-link">Older →</a>')
+        return f'''
+            <nav class="pagination" aria-label="Pagination">
+                {"".join(links)}
+            </nav>
+            '''
+
+    def render_page(self, relative_url, template_name, extra_vars, page_title=DEFAULT_PAGE_TITLE):
+        """Render a page template inside base.html and write it to relative_url"""
+        base_template = self.load_template('base.html')
+        page_template = self.load_template(template_name)
+        if not (page_template and base_template):
+            return False
+        
+        root = root_prefix(relative_url)
+        # Fill the page template first, then wrap it in the base template
+        variables = {
+            'page_title': page_title,
+            'main_content': page_template.render(dict(extra_vars, root=root)),
+            'root': root
+        }
+        output_path = self.output_dir / relative_url
+        final_html = self.render_base(base_template, variables, output_path)
+        
+        # Write output file
+        with self.profiler.stage('write'):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(output_path, final_html)
+        self.page_paths.add(output_path)
+        return True
+
+    def generate_paginated_listing(self, first_page_url, template_name, slot_name, posts,
+                                   extra_vars=None, page_title=DEFAULT_PAGE_TITLE):
+        """Write every page of a listing and return the URLs written"""
+        pages = self.paginate(posts)
+        urls = []
+        for number, page_posts in enumerate(pages, start=1):
+            url = self.listing_page_url(first_page_url, number)
+            root = root_prefix(url)
+            variables = dict(extra_vars or {})
+            variables[slot_name] = "".join(self.post_card(post, root) for post in page_posts)
+            variables['pagination'] = self.pagination_html(first_page_url, number, len(pages), root)
+            if self.render_page(url, template_name, variables, page_title):
+                urls.append(url)
         
-        return cards_html
+        # Remove pages left over from a build with more pages
+        pages_dir = (self.output_dir / self.listing_page_url(first_page_url, 2)).parent
+        if pages_dir.is_dir():
+            for stale in pages_dir.glob("*.html"):
+                if self.listing_page_url(first_page_url, int(stale.stem) if stale.stem.isdigit() else 0) not in urls:
+                    stale.unlink()
+        return urls
+
+    def archive_groups(self, blogs, writeups):
+        """Sorted (first page URL, (title, posts)) for every tag and category archive"""
+        posts = sorted(blogs + writeups, key=lambda x: x.date, reverse=True)
+        archives = {}
+        for post in posts:
+            for tag in post.tags:
+                archives.setdefault(self.archive_url('tags', tag), (f"Tagged: {tag}", []))[1].append(post)
+            category = post.category
+            archives.setdefault(self.archive_url('categories', category), (category, []))[1].append(post)
+        return [(url, group) for url, group in sorted(archives.items()) if not url.endswith('/.html')]
+
+    def listing_pages(self, blogs, writeups):
+        """(url, template name, posts) for listing pages after the first and every archive page, for the sitemap"""
+        pages = []
+        for first_page_url, posts in [('blogs.html', blogs), ('writeups.html', writeups)]:
+            pages += [(self.listing_page_url(first_page_url, number), first_page_url, page_posts)
+                      for number, page_posts in enumerate(self.paginate(posts), start=1) if number > 1]
+        for first_page_url, (_, archive_posts) in self.archive_groups(blogs, writeups):
+            pages += [(self.listing_page_url(first_page_url, number), 'archive.html', page_posts)
+                      for number, page_posts in enumerate(self.paginate(archive_posts), start=1)]
+        return pages
+
+    def generate_archive_pages(self, blogs, writeups, only=None):
+        """Generate paginated per-tag and per-category archive pages, or those whose first page is in only"""
+        urls = []
+        for first_page_url, (title, archive_posts) in self.archive_groups(blogs, writeups):
+            if only is not None and first_page_url not in only:
+                continue
+            count = len(archive_posts)
+            urls += self.generate_paginated_listing(
+                first_page_url, 'archive.html', 'archive_cards', archive_posts,
+                {
+                    'archive_title': title,
+                    'archive_description': f"{count} post{'s' if count != 1 else ''}"
+                },
+                page_title=f"{title} - Geetansh Cybersecurity"
+            )
+        print(f"Generated: {len(urls)} tag and category archive pages")
+        return urls
     
+    def post_listings(self, post):
+        """First-page URLs of the listings and archives that show a card for post"""
+        listings = {'writeups.html' if post.kind == 'writeup' else 'blogs.html',
+                    self.archive_url('categories', post.category)}
+        listings.update(self.archive_url('tags', tag) for tag in post.tags)
+        return listings
+
+    def remove_listing(self, first_page_url):
+        """Delete every page of a listing or archive that no longer has any posts"""
+        pages = [self.output_dir / first_page_url]
+        pages_dir = (self.output_dir / self.listing_page_url(first_page_url, 2)).parent
+        if pages_dir.is_dir():
+            pages += pages_dir.glob("*.html")
+        for page_path in pages:
+            if page_path.exists():
+                page_path.unlink()
+            self.page_paths.discard(page_path)
+        print(f"Removed: {first_page_url}")
+
+    def prune_archive(self):
+        """Delete archive pages this build did not write, such as those of tags no post uses any more"""
+        archive_dir = self.output_dir / ARCHIVE_DIR
+        if not archive_dir.is_dir():
+            return
+        removed = 0
+        for path in sorted(archive_dir.rglob("*"), reverse=True):
+            if path.is_dir():
+                if not any(path.iterdir()):
+                    path.rmdir()
+                continue
+            # Precompressed copies go with their page
+            page_path = path.with_suffix('') if path.name.endswith(PRECOMPRESS_ENCODINGS) else path
+            if page_path not in self.page_paths:
+                path.unlink()
+                if page_path == path:
+                    removed += 1
+        if removed:
+            print(f"Removed: {removed} stale archive page{'s' if removed != 1 else ''}")
+    
+    def post_root_prefix(self, post):
+        """Relative prefix from a post page back to the site root"""
+        if Path(post.folder_path).name in ['Blog', 'Writeups']:
+            # Root level posts are saved in the root directory
+            return ""
+        # Folder-based posts are saved two levels down, next to their index.md
+        return "../../"
+
+    def post_output_path(self, post):
+        """Path of the generated HTML page for a post"""
+        folder_path = Path(post.folder_path)
+        if folder_path.name in ['Blog', 'Writeups']:
+            # Root level posts are saved in the root directory
+            return self.output_dir / f"{post.filename}.html"
+        # Folder-based posts are saved in the same folder as their index.md
+        return self.output_dir / folder_path.relative_to(self.base_dir) / f"{post.filename}.html"
+
+    def post_source_dir(self, post):
+        """Source directory mirroring a post page's directory; page-relative images live here"""
+        return self.base_dir / self.post_output_path(post).parent.relative_to(self.output_dir)
+
+    def post_url(self, post):
+        """URL of a post page relative to the site root"""
+        return self.post_output_path(post).relative_to(self.output_dir).as_posix()
+
+    def generate_search_index(self):
+        """Write the sharded client-side search index to search/ from the posts added so far"""
+        if not self.search_indexer:
+            return
+        
+        # Skip the rebuild entirely when no indexed post changed since the last build
+        search_dir = self.output_dir / "search"
+        corpus_key = self.search_indexer.corpus_key()
+        marker_path = self.search_indexer.cache_dir / "corpus"
+        if self.search_indexer.use_cache and (search_dir / "docs.json").exists() and marker_path.exists():
+            if marker_path.read_text(encoding='utf-8') == corpus_key:
+                print("Search index up to date")
+                return
+        
+        files = self.search_indexer.build()
+        search_dir.mkdir(exist_ok=True)
+        written = 0
+        for name, content in files.items():
+            if write_if_changed(search_dir / name, content):
+                written += 1
+        
+        # Drop shards for prefixes that no longer occur
+        for stale in search_dir.glob("*.json"):
+            if stale.name not in files:
+                stale.unlink()
+        
+        if self.search_indexer.use_cache:
+            marker_path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(marker_path, corpus_key)
+        total_bytes = sum(len(content.encode('utf-8')) for content in files.values())
+        print(f"Generated: search index ({len(files) - 1} shards, {total_bytes / 1024:.0f} KB, "
+              f"{written} files updated)")
+
+    def index_post(self, post, content):
+        """Add a post to the search index while its rendered content is at hand"""
+        if self.search_indexer:
+            self.search_indexer.add(post, self.post_url(post), post.kind, content)
+
+    def prepare_images(self, post, content):
+        """Generate image variants for a post in parallel before its page is written"""
+        if not self.image_optimizer:
+            return
+        
+        page_dir = self.post_output_path(post).parent
+        source_dir = self.post_source_dir(post)
+        jobs = {(source_dir / unquote(src), page_dir) for src in self.image_optimizer.local_sources(content)}
+        if not jobs:
+            return
+        
+        with self.profiler.stage('images'):
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                list(executor.map(lambda job: self.image_optimizer.image_info(*job), jobs))
+
+    def optimize_post_images(self, post, content):
+        """Return the post HTML with responsive, lazily loaded images"""
+        if not self.image_optimizer:
+            return content
+        
+        page_dir = self.post_output_path(post).parent
+        with self.profiler.stage('image rewrite'):
+            html_content, images, original, optimized = self.image_optimizer.rewrite_images(
+                content, page_dir, self.post_source_dir(post))
+        if images and optimized < original:
+            saved = 100 * (original - optimized) / original
+            print(f"Images: {post.filename}: {images} images, {original / 1024:.0f} KB -> "
+                  f"{optimized / 1024:.0f} KB ({saved:.0f}% saved)")
+        return html_content
+
     def generate_individual_pages(self, blogs, writeups):
-        """Generate individual blog and writeup pages"""
+        """Render, write and drop each blog and writeup page in turn.
+
+        Posts whose body fails to render are removed from blogs and writeups so
+        listings never link to a missing page.
+        """
         base_template = self.load_template('base.html')
+        if base_template is None:
+            return
+        if self.image_optimizer:
+            from nyx_images import PILLOW_AVAILABLE
+            if not PILLOW_AVAILABLE:
+                print("Pillow not available: adding image dimensions and lazy loading only")
+        
+        written = set()
+        for post, content in self.iter_post_contents(blogs + writeups):
+            with self.profiler.stage('post page', post.file_path):
+                self.generate_post_page(post, content, base_template)
+            written.add(post.file_path)
+        
+        blogs[:] = [blog for blog in blogs if blog.file_path in written]
+        writeups[:] = [writeup for writeup in writeups if writeup.file_path in written]
+
+    def generate_post_page(self, post, content, base_template):
+        """Record what listings need from a post's body, then write its page"""
+        self.index_post(post, content)
+        self.prepare_images(post, content)
+        if post.kind == 'writeup':
+            self.generate_writeup_page(post, content, base_template)
+        else:
+            self.generate_blog_page(post, content, base_template)
+
+    def link_entry(self, post):
+        return [self.post_url(post), post.title, post.date]
+
+    def link_posts(self, blogs, writeups):
+        """Give every post its newer/older neighbours by date and its related posts"""
+        posts = blogs + writeups
+        if self.related_posts and posts:
+            related = self.related_posts.build(posts)
+        else:
+            related = [[] for _ in posts]
+        
+        links = {}
+        index = 0
+        for siblings in (blogs, writeups):
+            for position, post in enumerate(siblings):
+                post.links = {
+                    'newer': self.link_entry(siblings[position - 1]) if position > 0 else None,
+                    'older': self.link_entry(siblings[position + 1]) if position + 1 < len(siblings) else None,
+                    'related': [self.link_entry(posts[other]) for other in related[index]]
+                }
+                links[self.post_url(post)] = post.links
+                index += 1
+        if self.use_cache:
+            self.save_links(links)
+    
+    def save_links(self, links):
+        """Remember every page's navigation links for builds that only write some pages"""
+        self.links_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.links_path, json.dumps(links, sort_keys=True))
+    
+    def load_links(self):
+        """Navigation links by post URL from the last full build"""
+        try:
+            with open(self.links_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def post_links_html(self, post, root):
+        """Related-posts section and newer/older links for a post page"""
+        links = post.links or {}
+        related_html = ""
+        if links.get('related'):
+            items = "".join(f'''
+                        <li><a href="{root}{url}">{title}</a> <span class="date">{date}</span></li>'''
+                            for url, title, date in links['related'])
+            related_html = f'''
+                <section class="related-posts">
+                    <h2>Related posts</h2>
+                    <ul class="related-list">{items}
+                    </ul>
+                </section>'''
         
-        # Generate individual blog pages
-        for blog in blogs:
-            page_content = f'''
+        pager = []
+        if links.get('older'):
+            url, title, _ = links['older']
+            pager.append(f'<a href="{root}{url}" class="pager-link pager-older" rel="prev">← {title}</a>')
+        if links.get('newer'):
+            url, title, _ = links['newer']
+            pager.append(f'<a href="{root}{url}" class="pager-link pager-newer" rel="next">{title} →</a>')
+        pager_html = ""
+        if pager:
+            pager_html = f'''
+                    <div class="post-pager">
+                        {"".join(pager)}
+                    </div>'''
+        return related_html, pager_html
+
+    def prefetch_html(self, post, root):
+        """Prefetch hints for the pages a reader is likely to open next"""
+        links = post.links or {}
+        urls = [entry[0] for entry in [links.get('newer')] + links.get('related', []) if entry]
+        return "".join(f'\n    <link rel="prefetch" href="{root}{url}">' for url in dict.fromkeys(urls))
+
+    def post_body(self, post, content, root, output_path):
+        """Post HTML with optimized images and offloaded code blocks, plus the <head> tags it needs"""
+        content = self.optimize_post_images(post, content)
+        page_head = ""
+        # Token classes are collected before large blocks move out to fragments
+        if self.highlight_css:
+            page_head = self.highlight_css.head_html(self.highlight_css.page_classes(content), root, output_path)
+        fragments = 0
+        if self.code_fragments:
+            content, fragments = self.code_fragments.offload(content, root)
+        if fragments:
+            page_head += f'\n    <script src="{root}assets/code-fragments.js" defer></script>'
+        page_head += self.prefetch_html(post, root)
+        return content, page_head
+
+    def generate_blog_page(self, blog, content, base_template):
+        """Generate the page for a single blog post"""
+        root = self.post_root_prefix(blog)
+        # Determine output path based on blog location
+        output_path = self.post_output_path(blog)
+        content, page_head = self.post_body(blog, content, root, output_path)
+        related_html, pager_html = self.post_links_html(blog, root)
+        page_content = f'''
             <main class="content-page">
                 <article class="blog-post">
                     <header class="post-header">
-                        <h1>{blog['title']}</h1>
+                        <h1>{blog.title}</h1>
                         <div class="post-meta">
-                            <span class="date">{blog['date']}</span>
+                            <span class="date">{blog.date}</span>
                             <div class="tags">
-                                {" ".join([f'<span class="tag">{tag}</span>' for tag in blog['tags']])}
+                                {self.tags_html(blog, root)}
                             </div>
                         </div>
                     </header>
                     <div class="post-content">
-                        {blog['content']}
+                        {content}
                     </div>
-                </article>
+                </article>{related_html}
                 <nav class="post-navigation">
-                    <a href="../blogs.html" class="back-link">← Back to Blogs</a>
+                    <a href="{root}blogs.html" class="back-link">← Back to Blogs</a>{pager_html}
                 </nav>
             </main>
             '''
-            
-            variables = {
-                'page_title': f"{blog['title']} - Geetansh Cybersecurity",
-                'main_content': page_content
-            }
-            
-            final_html = self.replace_template_variables(base_template, variables)
-            
-            # Determine output path based on blog location
-            blog_folder_path = Path(blog['folder_path'])
-            if blog_folder_path.name in ['Blog', 'Writeups']:
-                # Root level blog - save in root directory
-                output_path = self.output_dir / f"{blog['filename']}.html"
-            else:
-                # Folder-based blog - save in the same folder
-                blog_folder_path.mkdir(exist_ok=True)
-                output_path = blog_folder_path / f"{blog['filename']}.html"
-                # Update navigation for folder-based blogs
-                final_html = final_html.replace('href="../blogs.html"', 'href="../../blogs.html"')
-                final_html = final_html.replace('href="assets/', 'href="../../assets/')
-                final_html = final_html.replace('href="index.html"', 'href="../../index.html"')
-                final_html = final_html.replace('href="blogs.html"', 'href="../../blogs.html"')
-                final_html = final_html.replace('href="writeups.html"', 'href="../../writeups.html"')
-                final_html = final_html.replace('href="services.html"', 'href="../../services.html"')
-                final_html = final_html.replace('href="about.html"', 'href="../../about.html"')
-                final_html = final_html.replace('href="contact.html"', 'href="../../contact.html"')
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(final_html)
-            
-            print(f"Generated blog: {output_path}")
         
-        # Generate individual writeup pages
-        for writeup in writeups:
-            page_content = f'''
+        variables = {
+            'page_title': f"{blog.title} - Geetansh Cybersecurity",
+            'main_content': page_content,
+            'page_head': page_head,
+            'root': root
+        }
+        
+        final_html = self.render_base(base_template, variables, output_path)
+        with self.profiler.stage('write'):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(output_path, final_html)
+        self.page_paths.add(output_path)
+        
+        print(f"Generated blog: {output_path}")
+
+    def generate_writeup_page(self, writeup, content, base_template):
+        """Generate the page for a single CTF writeup"""
+        root = self.post_root_prefix(writeup)
+        # Determine output path based on writeup location
+        output_path = self.post_output_path(writeup)
+        content, page_head = self.post_body(writeup, content, root, output_path)
+        related_html, pager_html = self.post_links_html(writeup, root)
+        page_content = f'''
             <main class="content-page">
                 <article class="writeup-post">
                     <header class="post-header">
-                        <h1>{writeup['title']}</h1>
+                        <h1>{writeup.title}</h1>
                         <div class="post-meta">
-                            <span class="date">{writeup['date']}</span>
-                            <span class="category">{writeup['category']}</span>
+                            <span class="date">{writeup.date}</span>
+                            <a href="{root}{self.archive_url("categories", writeup.category)}" class="category">{writeup.category}</a>
                             <div class="tags">
-                                {" ".join([f'<span class="tag">{tag}</span>' for tag in writeup['tags']])}
+                                {self.tags_html(writeup, root)}
                             </div>
                         </div>
                     </header>
                     <div class="post-content">
-                        {writeup['content']}
+                        {content}
                     </div>
-                </article>
+                </article>{related_html}
                 <nav class="post-navigation">
-                    <a href="../writeups.html" class="back-link">← Back to Writeups</a>
+                    <a href="{root}writeups.html" class="back-link">← Back to Writeups</a>{pager_html}
                 </nav>
             </main>
             '''
-            
-            variables = {
-                'page_title': f"{writeup['title']} - Geetansh Cybersecurity",
-                'main_content': page_content
-            }
-            
-            final_html = self.replace_template_variables(base_template, variables)
-            
-            # Determine output path based on writeup location
-            writeup_folder_path = Path(writeup['folder_path'])
-            if writeup_folder_path.name in ['Blog', 'Writeups']:
-                # Root level writeup - save in root directory
-                output_path = self.output_dir / f"{writeup['filename']}.html"
-            else:
-                # Folder-based writeup - save in the same folder
-                writeup_folder_path.mkdir(exist_ok=True)
-                output_path = writeup_folder_path / f"{writeup['filename']}.html"
-                # Update navigation for folder-based writeups
-                final_html = final_html.replace('href="../writeups.html"', 'href="../../writeups.html"')
-                final_html = final_html.replace('href="assets/', 'href="../../assets/')
-                final_html = final_html.replace('href="index.html"', 'href="../../index.html"')
-                final_html = final_html.replace('href="blogs.html"', 'href="../../blogs.html"')
-                final_html = final_html.replace('href="writeups.html"', 'href="../../writeups.html"')
-                final_html = final_html.replace('href="services.html"', 'href="../../services.html"')
-                final_html = final_html.replace('href="about.html"', 'href="../../about.html"')
-                final_html = final_html.replace('href="contact.html"', 'href="../../contact.html"')
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(final_html)
-            
-            print(f"Generated writeup: {output_path}")
+        
+        variables = {
+            'page_title': f"{writeup.title} - Geetansh Cybersecurity",
+            'main_content': page_content,
+            'page_head': page_head,
+            'root': root
+        }
+        
+        final_html = self.render_base(base_template, variables, output_path)
+        with self.profiler.stage('write'):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            write_if_changed(output_path, final_html)
+        self.page_paths.add(output_path)
+        
+        print(f"Generated writeup: {output_path}")
     
+    def absolute_url(self, relative_url):
+        """Absolute URL of a page given its URL relative to the site root"""
+        return f"{self.base_url}/{quote(relative_url)}"
+
+    def template_lastmod(self, template_name):
+        """Last change of a page rendered from template_name inside base.html"""
+        return max(self.lastmod.date(self.templates_dir / template_name),
+                   self.lastmod.date(self.templates_dir / "base.html"))
+
+    def sitemap_entries(self, blogs, writeups):
+        """Yield (url, lastmod, changefreq, priority) for every page of the site"""
+        post_dates = {post.file_path: self.lastmod.date(post.file_path) for post in blogs + writeups}
+        
+        def newest(template_name, posts):
+            return max([self.template_lastmod(template_name)] + [post_dates[post.file_path] for post in posts])
+        
+        # Main pages change whenever a post they list does
+        yield '', newest('index.html', blogs + writeups), 'daily', '1.0'
+        yield 'blogs.html', newest('blogs.html', blogs), 'weekly', '0.9'
+        yield 'writeups.html', newest('writeups.html', writeups), 'weekly', '0.9'
+        for page, priority in [('services.html', '0.8'), ('about.html', '0.7'), ('contact.html', '0.7')]:
+            yield page, self.template_lastmod(page), 'monthly', priority
+        
+        for post in blogs + writeups:
+            yield self.post_url(post), post_dates[post.file_path], 'monthly', '0.6'
+        
+        # Paginated listings and tag/category archives
+        for url, template_name, page_posts in self.listing_pages(blogs, writeups):
+            yield url, newest(template_name, page_posts), 'weekly', '0.5'
+
     def generate_sitemap(self, blogs, writeups):
-        """Generate XML sitemap for Google Search Console"""
-        base_url = "https://geetanshaditya.com"  # Update with your actual domain
-        sitemap_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
-        sitemap_content += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-        
-        # Add main pages
-        main_pages = [
-            ('', '1.0', 'daily'),  # Homepage
-            ('blogs.html', '0.9', 'weekly'),
-            ('writeups.html', '0.9', 'weekly'),
-            ('services.html', '0.8', 'monthly'),
-            ('about.html', '0.7', 'monthly'),
-            ('contact.html', '0.7', 'monthly')
-        ]
-        
-        for page, priority, changefreq in main_pages:
-            sitemap_content += f'''  <url>
-    <loc>{base_url}/{page}</loc>
+        """Stream the sitemap into shards of at most SITEMAP_MAX_URLS URLs, indexed by sitemap.xml.
+
+        Also writes robots.txt. Returns the paths of the files written.
+        """
+        if not self.base_url:
+            print("Warning: no --base-url given and no CNAME file; sitemap.xml and robots.txt were not written")
+            return []
+        
+        entries = self.sitemap_entries(blogs, writeups)
+        shards = []
+        url_count = 0
+        with self.profiler.stage('write'):
+            # Each pass of the outer loop takes the first URL of the next shard
+            for first_entry in entries:
+                path = self.output_dir / f"sitemap-{len(shards) + 1}.xml"
+                newest = ''
+                with StreamingFileWriter(path) as writer:
+                    writer.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                                 f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n')
+                    for url, lastmod, changefreq, priority in chain([first_entry],
+                                                                    islice(entries, SITEMAP_MAX_URLS - 1)):
+                        writer.write(f'''  <url>
+    <loc>{html.escape(self.absolute_url(url))}</loc>
+    <lastmod>{lastmod}</lastmod>
     <changefreq>{changefreq}</changefreq>
     <priority>{priority}</priority>
   </url>
-'''
-        
-        # Add blog posts
-        for blog in blogs:
-            blog_folder_path = Path(blog['folder_path'])
-            if blog_folder_path.name in ['Blog', 'Writeups']:
-                url_path = f"{blog['filename']}.html"
-            else:
-                url_path = f"Blog/{blog_folder_path.name}/{blog['filename']}.html"
+''')
+                        newest = max(newest, lastmod)
+                        url_count += 1
+                    writer.write('</urlset>\n')
+                shards.append((path, newest, writer.changed))
             
-            sitemap_content += f'''  <url>
-    <loc>{base_url}/{url_path}</loc>
-    <lastmod>{blog['date']}</lastmod>
-    <changefreq>monthly</changefreq>
-    <priority>0.6</priority>
-  </url>
+            # The index is small: one entry per shard
+            index_content = '<?xml version="1.0" encoding="UTF-8"?>\n'
+            index_content += f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+            for path, newest, _ in shards:
+                index_content += f'''  <sitemap>
+    <loc>{html.escape(self.absolute_url(path.name))}</loc>
+    <lastmod>{newest}</lastmod>
+  </sitemap>
 '''
-        
-        # Add writeups
-        for writeup in writeups:
-            writeup_folder_path = Path(writeup['folder_path'])
-            if writeup_folder_path.name in ['Blog', 'Writeups']:
-                url_path = f"{writeup['filename']}.html"
-            else:
-                url_path = f"Writeups/{writeup_folder_path.name}/{writeup['filename']}.html"
+            index_content += '</sitemapindex>\n'
+            index_path = self.output_dir / "sitemap.xml"
+            index_changed = write_if_changed(index_path, index_content)
             
-            sitemap_content += f'''  <url>
-    <loc>{base_url}/{url_path}</loc>
-    <lastmod>{writeup['date']}</lastmod>
-    <changefreq>monthly</changefreq>
-    <priority>0.6</priority>
-  </url>
-'''
+            # Remove shards left over from a build with more URLs
+            shard_paths = {path for path, _, _ in shards}
+            for stale in self.output_dir.glob("sitemap-*.xml"):
+                if stale not in shard_paths:
+                    for sibling in [stale] + [stale.with_name(stale.name + suffix) for suffix in PRECOMPRESS_ENCODINGS]:
+                        sibling.unlink(missing_ok=True)
+            
+            robots_path = self.output_dir / "robots.txt"
+            robots_changed = write_if_changed(robots_path, f"""User-agent: *
+Allow: /
+
+Sitemap: {self.base_url}/sitemap.xml
+""")
+        self.lastmod.save()
+        
+        updated = sum(changed for _, _, changed in shards) + index_changed + robots_changed
+        if updated:
+            print(f"Generated: sitemap.xml ({url_count} URLs in {len(shards)} sitemap file"
+                  f"{'s' if len(shards) != 1 else ''}) and robots.txt, {updated} file(s) updated")
+        else:
+            print("Sitemap up to date")
+        return [index_path, robots_path] + sorted(shard_paths)
+
+    def feed_entry(self, post):
+        """Fields shared by the Atom and JSON feed entries of a post"""
+        lastmod = self.lastmod.date(post.file_path)
+        published = post.date if FEED_DATE_RE.match(post.date or '') else lastmod
+        return {
+            'url': self.absolute_url(self.post_url(post)),
+            'title': post.title,
+            'summary': post.description or html.unescape(post.excerpt),
+            'published': f"{published}T00:00:00Z",
+            'updated': f"{max(published, lastmod)}T00:00:00Z",
+            'tags': post.tags
+        }
+
+    def write_atom_feed(self, path, title, listing_url, entries, updated):
+        """Stream an Atom feed; returns True when the file changed"""
+        escape = html.escape
+        with StreamingFileWriter(path) as writer:
+            writer.write(f'''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>{escape(title)}</title>
+  <id>{escape(self.absolute_url(listing_url))}</id>
+  <link rel="alternate" type="text/html" href="{escape(self.absolute_url(listing_url))}"/>
+  <link rel="self" type="application/atom+xml" href="{escape(self.absolute_url(path.relative_to(self.output_dir).as_posix()))}"/>
+  <updated>{updated}</updated>
+  <author><name>{escape(FEED_AUTHOR)}</name></author>
+''')
+            for entry in entries:
+                categories = "".join(f'\n    <category term="{escape(tag)}"/>' for tag in entry['tags'])
+                writer.write(f'''  <entry>
+    <title>{escape(entry['title'])}</title>
+    <link rel="alternate" type="text/html" href="{escape(entry['url'])}"/>
+    <id>{escape(entry['url'])}</id>
+    <published>{entry['published']}</published>
+    <updated>{entry['updated']}</updated>
+    <summary>{escape(entry['summary'])}</summary>{categories}
+  </entry>
+''')
+            writer.write('</feed>\n')
+        return writer.changed
+
+    def generate_feeds(self, blogs, writeups):
+        """Write Atom and JSON feeds of the newest blog posts and writeups to feeds/.
+
+        Feeds are built from the same post records as the listings and are only
+        rewritten when an entry changed. Returns the paths of the feeds.
+        """
+        if not self.base_url:
+            print("Warning: no --base-url given and no CNAME file; feeds were not written")
+            return []
         
-        sitemap_content += '</urlset>'
+        feeds_dir = self.output_dir / "feeds"
+        paths = []
+        updated = 0
+        with self.profiler.stage('write'):
+            for name, title, listing_url, posts in [('blogs', "Blog", 'blogs.html', blogs),
+                                                    ('writeups', "CTF Writeups", 'writeups.html', writeups)]:
+                title = f"{FEED_AUTHOR} - {title}"
+                entries = [self.feed_entry(post) for post in posts[:FEED_MAX_ENTRIES]]
+                # Derived from the entries so an unchanged feed stays byte-identical
+                feed_updated = max((entry['updated'] for entry in entries),
+                                   default=f"{self.template_lastmod(listing_url)}T00:00:00Z")
+                
+                atom_path = feeds_dir / f"{name}.xml"
+                updated += self.write_atom_feed(atom_path, title, listing_url, entries, feed_updated)
+                
+                json_path = feeds_dir / f"{name}.json"
+                json_feed = {
+                    'version': "https://jsonfeed.org/version/1.1",
+                    'title': title,
+                    'home_page_url': self.absolute_url(listing_url),
+                    'feed_url': self.absolute_url(f"feeds/{name}.json"),
+                    'authors': [{'name': FEED_AUTHOR}],
+                    'items': [{
+                        'id': entry['url'],
+                        'url': entry['url'],
+                        'title': entry['title'],
+                        'summary': entry['summary'],
+                        'date_published': entry['published'],
+                        'date_modified': entry['updated'],
+                        'tags': entry['tags']
+                    } for entry in entries]
+                }
+                updated += write_if_changed(json_path, json.dumps(json_feed, indent=1, ensure_ascii=False) + "\n")
+                paths += [atom_path, json_path]
+        self.lastmod.save()
         
-        # Write sitemap.xml
-        sitemap_path = self.output_dir / "sitemap.xml"
-        with open(sitemap_path, 'w', encoding='utf-8') as f:
-            f.write(sitemap_content)
+        if updated:
+            print(f"Generated: {len(paths)} feeds in feeds/ ({updated} updated)")
+        else:
+            print("Feeds up to date")
+        return paths
+    
+    def referenced_files(self, output_path, content):
+        """Output-relative paths of local files referenced from an HTML or CSS file"""
+        references = set()
+        for attribute, _, css_url in LOCAL_REFERENCE_RE.findall(content):
+            # srcset holds "url width" candidates separated by commas
+            values = [candidate.split()[0] for candidate in attribute.split(',') if candidate.split()] \
+                if attribute else [css_url]
+            for value in values:
+                if re.match(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', value):
+                    continue
+                value = unquote(value.split('#', 1)[0].split('?', 1)[0])
+                if not value:
+                    continue
+                path = Path(os.path.normpath(output_path.parent / value))
+                try:
+                    references.add(path.relative_to(self.output_dir).as_posix())
+                except ValueError:
+                    # Links that climb out of the site are not ours to copy
+                    continue
+        return references
+
+    def stage_outputs(self, sweep=True):
+        """Collect every file the site needs, copying referenced assets into a separate output directory.
+
+        In a separate output directory, files no longer produced by the build are
+        removed unless sweep is False (partial builds only write some pages).
+        Returns the set of output-relative paths.
+        """
+        outputs = {path.relative_to(self.output_dir).as_posix() for path in self.page_paths}
+        outputs |= {path.name for path in self.output_dir.glob("sitemap*.xml")}
+        if (self.output_dir / "robots.txt").is_file():
+            outputs.add('robots.txt')
+        for generated_dir in [self.output_dir / "search", self.output_dir / "feeds", self.build_dir]:
+            if generated_dir.is_dir():
+                outputs |= {path.relative_to(self.output_dir).as_posix()
+                            for path in generated_dir.rglob("*")
+                            if path.is_file() and not path.name.endswith(PRECOMPRESS_ENCODINGS)}
+        for name in PASSTHROUGH_FILES:
+            if (self.base_dir / name).is_file():
+                if self.staged:
+                    copy_if_changed(self.base_dir / name, self.output_dir / name)
+                outputs.add(name)
         
-        print("Generated: sitemap.xml")
+        # Follow references from pages (and from stylesheets they link) to the files they need
+        pending = [self.output_dir / path for path in outputs if path.endswith(('.html', '.css'))]
+        copied = 0
+        missing = set()
+        while pending:
+            output_path = pending.pop()
+            try:
+                content = output_path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError):
+                continue
+            for relative_path in self.referenced_files(output_path, content) - outputs:
+                target = self.output_dir / relative_path
+                source = self.base_dir / relative_path
+                if self.staged and source.is_file() and copy_if_changed(source, target):
+                    copied += 1
+                if not target.is_file():
+                    missing.add(relative_path)
+                    continue
+                outputs.add(relative_path)
+                if relative_path.endswith('.css'):
+                    pending.append(target)
         
-        # Also generate robots.txt
-        robots_content = f"""User-agent: *
-Allow: /
+        if missing:
+            print(f"Missing referenced files: {', '.join(sorted(missing)[:5])}"
+                  f"{' ...' if len(missing) > 5 else ''}")
+        removed = 0
+        if self.staged and sweep:
+            for path in sorted(self.output_dir.rglob("*"), reverse=True):
+                relative_path = path.relative_to(self.output_dir).as_posix()
+                if path.is_file() and relative_path not in outputs and path.name not in (
+                        MANIFEST_NAME, MANIFEST_DIFF_NAME) and not (
+                        relative_path.endswith(PRECOMPRESS_ENCODINGS) and relative_path[:-3] in outputs):
+                    path.unlink()
+                    removed += 1
+                elif path.is_dir() and not any(path.iterdir()):
+                    path.rmdir()
+        if self.staged:
+            print(f"Staged {len(outputs)} files in {self.output_dir} ({copied} assets copied, "
+                  f"{removed} stale files removed)")
+        return outputs
 
-Sitemap: {base_url}/sitemap.xml
-"""
+    def write_manifest(self, outputs):
+        """Write the deploy manifest and its diff against the previous build"""
+        files = set(outputs)
+        for path in outputs:
+            for suffix in PRECOMPRESS_ENCODINGS:
+                if (self.output_dir / (path + suffix)).is_file():
+                    files.add(path + suffix)
         
-        robots_path = self.output_dir / "robots.txt"
-        with open(robots_path, 'w', encoding='utf-8') as f:
-            f.write(robots_content)
+        manifest_path = self.output_dir / MANIFEST_NAME
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = {entry['path']: entry for entry in json.load(f)['files']}
+        except (OSError, ValueError, KeyError):
+            previous = {}
         
-        print("Generated: robots.txt")
-    
+        entries = []
+        for path in sorted(files):
+            file_path = self.output_dir / path
+            entries.append({'path': path, 'size': file_path.stat().st_size, 'sha256': file_sha256(file_path)})
+        current = {entry['path']: entry for entry in entries}
+        diff = {
+            'added': sorted(current.keys() - previous.keys()),
+            'changed': sorted(path for path in current.keys() & previous.keys()
+                              if current[path]['sha256'] != previous[path]['sha256']),
+            'removed': sorted(previous.keys() - current.keys())
+        }
+        write_if_changed(manifest_path, json.dumps({'files': entries}, indent=1) + "\n")
+        write_if_changed(self.output_dir / MANIFEST_DIFF_NAME, json.dumps(diff, indent=1) + "\n")
+        total = sum(entry['size'] for entry in entries)
+        print(f"Manifest: {len(entries)} files, {total / 1024 / 1024:.1f} MB "
+              f"({len(diff['added'])} added, {len(diff['changed'])} changed, {len(diff['removed'])} removed)")
+
+    def generate_main_pages(self, blogs, writeups, only=None):
+        """Generate the home page, paginated listings, archives and static pages.
+
+        With `only`, a set of first-page URLs, just the home page, listings and
+        archives named in it are regenerated and static pages are left alone.
+        """
+        if only is None or 'index.html' in only:
+            if self.render_page('index.html', 'index.html', {
+                'latest_blogs': self.generate_blog_cards(blogs, HOME_PAGE_POSTS),
+                'latest_writeups': self.generate_writeup_cards(writeups, HOME_PAGE_POSTS)
+            }):
+                print("Generated: index.html")
+        
+        for first_page_url, slot_name, posts in [('blogs.html', 'all_blogs', blogs),
+                                                 ('writeups.html', 'all_writeups', writeups)]:
+            if only is not None and first_page_url not in only:
+                continue
+            urls = self.generate_paginated_listing(first_page_url, first_page_url, slot_name, posts)
+            if urls:
+                print(f"Generated: {first_page_url} ({len(urls)} page{'s' if len(urls) != 1 else ''})")
+        self.generate_archive_pages(blogs, writeups, only)
+        if only is not None:
+            return
+        self.prune_archive()
+        
+        for output_file in ['services.html', 'about.html', 'contact.html']:
+            if self.render_page(output_file, output_file, {}):
+                print(f"Generated: {output_file}")
+        
+        # Cards are only reused within one pass over the listings
+        for post in blogs + writeups:
+            post.cards = {}
+
+    def reset_build_stats(self):
+        """Clear per-build counters so repeated builds report their own numbers"""
+        self.parsed_count = 0
+        self.cached_count = 0
+        self.used_cache_keys = set()
+        self.highlight_cache.hits = 0
+        self.highlight_cache.misses = 0
+        self.profiler.events = []
+        self.page_paths = set()
+        if self.search_indexer:
+            self.search_indexer.reset()
+        if self.highlight_css:
+            self.highlight_css.load()
+        if self.code_fragments:
+            self.code_fragments.reset()
+        if self.lastmod:
+            self.lastmod.reset()
+
+    def build_assets(self):
+        """Minify and fingerprint the stylesheet when the asset pipeline is on, then recompile the templates"""
+        if self.assets:
+            self.assets.build()
+        self.templates = self.compile_templates()
+
     def generate_all_pages(self):
         """Generate all website pages"""
         print("Generating NYX Cybersecurity Portfolio...")
+        self.reset_build_stats()
         
-        # Get content data
-        blogs = self.get_blog_posts()
-        writeups = self.get_writeups()
+        with self.profiler.stage('build'):
+            # Minify and fingerprint the stylesheet, then point base.html at it
+            with self.profiler.stage('assets'):
+                self.build_assets()
+            
+            # Listings only need front matter, so scan headers without rendering bodies
+            with self.profiler.stage('scan'):
+                blogs = self.get_blog_posts()
+                writeups = self.get_writeups()
+            print(f"Found {len(blogs)} blog posts and {len(writeups)} writeups")
+            
+            # Archive slugs, neighbours and related posts are settled before any page is written
+            self.assign_archive_slugs(blogs + writeups)
+            with self.profiler.stage('related posts'):
+                self.link_posts(blogs, writeups)
+            
+            # Render each post, write its page and drop its body before the next
+            try:
+                with self.profiler.stage('post pages'):
+                    self.generate_individual_pages(blogs, writeups)
+            finally:
+                self.close()
+            
+            print(f"Posts: parsed {self.parsed_count} / cached {self.cached_count}")
+            with self.profiler.stage('highlight css'):
+                if self.highlight_css:
+                    self.highlight_css.finish(full=True)
+            with self.profiler.stage('code fragments'):
+                if self.code_fragments:
+                    self.code_fragments.finish(full=True)
+                else:
+                    # Fragments left behind by builds that had them on
+                    shutil.rmtree(self.build_dir / "code", ignore_errors=True)
+            with self.profiler.stage('cache upkeep'):
+                self.cache.prune(self.used_cache_keys)
+                evicted = self.highlight_cache.evict()
+            
+            # Generate main pages from the excerpts gathered while writing posts
+            with self.profiler.stage('main pages'):
+                self.generate_main_pages(blogs, writeups)
+            
+            # Generate sitemap for SEO, and feeds from the same post records
+            with self.profiler.stage('sitemap'):
+                self.generate_sitemap(blogs, writeups)
+            with self.profiler.stage('feeds'):
+                self.generate_feeds(blogs, writeups)
+            
+            # Generate client-side search index
+            with self.profiler.stage('search index'):
+                self.generate_search_index()
+            
+            # Copy referenced assets into a separate output directory
+            with self.profiler.stage('stage outputs'):
+                outputs = self.stage_outputs()
+            
+            # Precompress everything the build wrote
+            if self.precompressor:
+                with self.profiler.stage('compress'):
+                    self.precompressor.run(self.output_dir / path for path in outputs)
+            
+            with self.profiler.stage('manifest'):
+                self.write_manifest(outputs)
         
-        print(f"Found {len(blogs)} blog posts and {len(writeups)} writeups")
+        if self.highlight_cache.enabled:
+            print(f"Highlight cache: {self.highlight_cache.hits} hits / "
+                  f"{self.highlight_cache.misses} misses ({evicted} evicted)")
+        if self.assets:
+            self.assets.report(verbose=self.profiler.enabled)
+        print("Portfolio generation complete!")
+        return blogs, writeups
+
+    def resolve_post_paths(self, names):
+        """Source files for --only arguments: a post folder, its index.md or a standalone .md file"""
+        file_paths = []
+        for name in names:
+            path = Path(name)
+            candidates = [path / "index.md", path, path.with_suffix('.md')]
+            match = next((candidate for candidate in candidates
+                          if candidate.suffix == '.md' and candidate.is_file()), None)
+            if match is not None:
+                match = Path(os.path.relpath(match, self.base_dir))
+            if match is None or not (self.blog_dir in match.parents or self.writeups_dir in match.parents):
+                print(f"No blog post or writeup found for {name}")
+                continue
+            file_paths.append(str(match))
+        return file_paths
+
+    def finish_partial_build(self, paths):
+        """Stage and precompress what a partial build wrote, leaving every other output in place"""
+        paths = set(paths)
+        if self.code_fragments:
+            paths |= self.code_fragments.paths
+        if self.highlight_css and self.highlight_css.filename:
+            paths.add(self.build_dir / self.highlight_css.filename)
+        if self.staged:
+            with self.profiler.stage('stage outputs'):
+                self.stage_outputs(sweep=False)
+        if self.precompressor:
+            with self.profiler.stage('compress'):
+                self.precompressor.run(paths, full=False)
+
+    def generate_post_subset(self, names):
+        """Write only the named post pages; listings, sitemap, search and manifest are left as they are"""
+        self.reset_build_stats()
+        file_paths = self.resolve_post_paths(names)
+        if not file_paths:
+            return
         
-        # Load base template
-        base_template = self.load_template('base.html')
+        with self.profiler.stage('build'):
+            with self.profiler.stage('assets'):
+                self.build_assets()
+            
+            with self.profiler.stage('scan'):
+                posts = [post for post in map(self.scan_post, file_paths) if post]
+            # Linking needs every post; reuse what the last full build worked out
+            links = self.load_links()
+            for post in posts:
+                post.links = links.get(self.post_url(post))
+            try:
+                with self.profiler.stage('post pages'):
+                    self.generate_individual_pages([post for post in posts if post.kind == 'blog'],
+                                                   [post for post in posts if post.kind == 'writeup'])
+            finally:
+                self.close()
+            print(f"Posts: parsed {self.parsed_count} / cached {self.cached_count}")
+            with self.profiler.stage('highlight css'):
+                if self.highlight_css:
+                    self.highlight_css.finish(full=False)
+            if self.code_fragments:
+                self.code_fragments.finish(full=False)
+            
+            self.finish_partial_build(self.page_paths)
+        print(f"Partial build complete: {len(self.page_paths)} page(s) written")
+
+    def generate_listing_pages(self):
+        """Regenerate the home page, listings, archives and static pages without writing post pages"""
+        self.reset_build_stats()
         
-        # Generate main pages
-        pages = [
-            ('index.html', 'index.html', {
-                'latest_blogs': self.generate_blog_cards(blogs, 3),
-                'latest_writeups': self.generate_writeup_cards(writeups, 3)
-            }),
-            ('blogs.html', 'blogs.html', {
-                'all_blogs': self.generate_blog_cards(blogs)
-            }),
-            ('writeups.html', 'writeups.html', {
-                'all_writeups': self.generate_writeup_cards(writeups)
-            }),
-            ('services.html', 'services.html', {}),
-            ('about.html', 'about.html', {}),
-            ('contact.html', 'contact.html', {})
-        ]
-        
-        for output_file, template_file, extra_vars in pages:
-            template_content = self.load_template(template_file)
+        with self.profiler.stage('build'):
+            with self.profiler.stage('assets'):
+                self.build_assets()
             
-            if template_content:
-                # Replace template variables in the template content first
-                template_content = self.replace_template_variables(template_content, extra_vars)
-                
-                # Replace template variables in base template
-                variables = {
-                    'page_title': "Geetansh Aditya | Cybersecurity Specialist - Reverse Engineering & DFIR",
-                    'main_content': template_content
-                }
-                
-                final_html = self.replace_template_variables(base_template, variables)
-                
-                # Write output file
-                output_path = self.output_dir / output_file
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    f.write(final_html)
-                
-                print(f"Generated: {output_file}")
+            with self.profiler.stage('scan'):
+                blogs = self.get_blog_posts()
+                writeups = self.get_writeups()
+            print(f"Found {len(blogs)} blog posts and {len(writeups)} writeups")
+            
+            # Cards need excerpts, which the build cache keeps apart from the bodies
+            try:
+                with self.profiler.stage('excerpts'):
+                    written = {post.file_path for post in self.load_excerpts(blogs + writeups)}
+            finally:
+                self.close()
+            blogs[:] = [blog for blog in blogs if blog.file_path in written]
+            writeups[:] = [writeup for writeup in writeups if writeup.file_path in written]
+            print(f"Posts: parsed {self.parsed_count} / cached {self.cached_count}")
+            
+            self.assign_archive_slugs(blogs + writeups)
+            with self.profiler.stage('main pages'):
+                self.generate_main_pages(blogs, writeups)
+            with self.profiler.stage('feeds'):
+                feed_paths = self.generate_feeds(blogs, writeups)
+            
+            self.finish_partial_build(self.page_paths | set(feed_paths))
+        print("Listing pages complete!")
+
+    def generate_sitemap_only(self):
+        """Regenerate the sitemap files and robots.txt from front matter alone"""
+        self.reset_build_stats()
+        
+        with self.profiler.stage('build'):
+            with self.profiler.stage('scan'):
+                blogs = self.get_blog_posts()
+                writeups = self.get_writeups()
+            
+            self.assign_archive_slugs(blogs + writeups)
+            with self.profiler.stage('sitemap'):
+                sitemap_paths = self.generate_sitemap(blogs, writeups)
+            
+            self.finish_partial_build(sitemap_paths)
+
+    def snapshot_sources(self):
+        """Map every watched source file to its (mtime, size)"""
+        snapshot = {}
+        watched_dirs = [self.blog_dir, self.writeups_dir, self.templates_dir, self.base_dir / "assets"]
+        for watched_dir in watched_dirs:
+            for root, _, files in os.walk(watched_dir):
+                for name in files:
+                    path = Path(root) / name
+                    # Post pages are generated next to their sources; ignore them
+                    if path.suffix == '.html' and watched_dir in (self.blog_dir, self.writeups_dir):
+                        continue
+                    if self.build_dir in path.parents:
+                        continue
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    snapshot[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def rebuild_changes(self, changed_paths, blogs, writeups):
+        """Re-render only the outputs affected by changed source files.
+
+        Returns the updated (blogs, writeups) lists.
+        """
+        changed = [Path(path) for path in changed_paths]
+        
+        # Template edits, and stylesheet edits once pages inline critical CSS, affect every page
+        stylesheet = self.base_dir / "assets" / "style.css"
+        if any(self.templates_dir in path.parents for path in changed) or (
+                self.assets and stylesheet in changed):
+            self.templates = self.compile_templates()
+            return self.generate_all_pages()
+        
+        changed_posts = [path for path in changed if path.suffix == '.md']
+        if not changed_posts:
+            # Assets and images only need the browser to reload
+            return blogs, writeups
         
-        # Generate individual blog and writeup pages
-        self.generate_individual_pages(blogs, writeups)
+        previous_links = {post.file_path: post.links for post in blogs + writeups}
+        # Listings that showed a changed post, and the home page if it was among the newest
+        previous = {Path(post.file_path): post for post in blogs + writeups}
+        previous_archives = {url for url, _ in self.archive_groups(blogs, writeups)}
+        previous_slugs = self.archive_slugs
+        changed_files = set(changed_posts)
+        listings = set()
+        for file_path in changed_files & previous.keys():
+            listings |= self.post_listings(previous[file_path])
+        newest = {Path(post.file_path) for post in blogs[:HOME_PAGE_POSTS] + writeups[:HOME_PAGE_POSTS]}
         
-        # Generate sitemap for SEO
+        rescanned = []
+        for path in changed_posts:
+            is_blog = self.blog_dir in path.parents
+            posts = blogs if is_blog else writeups
+            posts[:] = [post for post in posts if Path(post.file_path) != path]
+            
+            if not path.exists():
+                print(f"Removed: {path}")
+                continue
+            post = self.scan_post(str(path))
+            if post is None:
+                continue
+            posts.append(post)
+            rescanned.append(post)
+        
+        # Sort by date (newest first)
+        blogs.sort(key=lambda x: x.date, reverse=True)
+        writeups.sort(key=lambda x: x.date, reverse=True)
+        
+        # Changed posts, and posts whose neighbours or related posts changed with them
+        self.assign_archive_slugs(blogs + writeups)
+        self.link_posts(blogs, writeups)
+        targets = rescanned + [post for post in blogs + writeups
+                               if post not in rescanned and post.links != previous_links.get(post.file_path)]
+        base_template = self.load_template('base.html')
+        rendered = set()
+        for post, content in self.iter_post_contents(targets):
+            rendered.add(post.file_path)
+            if base_template:
+                self.generate_post_page(post, content, base_template)
+        failed = {post.file_path for post in rescanned} - rendered
+        blogs[:] = [post for post in blogs if post.file_path not in failed]
+        writeups[:] = [post for post in writeups if post.file_path not in failed]
+        if self.highlight_css:
+            self.highlight_css.finish(full=False)
+        if self.code_fragments:
+            self.code_fragments.finish(full=False)
+        
+        # Only listings that show a changed post, before or after the edit, are rewritten;
+        # a changed archive slug moves links on every listing
+        current = {Path(post.file_path): post for post in blogs + writeups}
+        for file_path in changed_files & current.keys():
+            listings |= self.post_listings(current[file_path])
+        newest |= {Path(post.file_path) for post in blogs[:HOME_PAGE_POSTS] + writeups[:HOME_PAGE_POSTS]}
+        if changed_files & newest:
+            listings.add('index.html')
+        archives = {url for url, _ in self.archive_groups(blogs, writeups)}
+        for first_page_url in sorted(previous_archives - archives):
+            self.remove_listing(first_page_url)
+        renamed = any(previous_slugs.get(key, slug) != slug for key, slug in self.archive_slugs.items())
+        self.generate_main_pages(blogs, writeups, None if renamed else listings)
+        
+        # The sitemap and feeds are single files; the sitemap carries the new lastmod dates
+        if self.lastmod:
+            self.lastmod.reset()
         self.generate_sitemap(blogs, writeups)
+        self.generate_feeds(blogs, writeups)
+        # Changed posts were re-indexed as their pages were written; drop the ones that are gone
+        if self.search_indexer:
+            for file_path in changed_files & (previous.keys() - current.keys()):
+                self.search_indexer.remove(self.post_url(previous[file_path]))
+            self.generate_search_index()
+        if self.staged:
+            self.stage_outputs()
+        return blogs, writeups
+
+    def serve(self, port=8000, interval=0.5):
+        """Build the site, serve it locally and rebuild affected pages on change"""
+        # The preview server only serves uncompressed files
+        self.precompressor = None
+        blogs, writeups = self.generate_all_pages()
+        self.build_id = 1
         
-        print("Portfolio generation complete!")
+        from http.server import ThreadingHTTPServer
+        handler = partial(live_reload_handler(self), directory=str(self.output_dir))
+        server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"Serving on http://127.0.0.1:{port}/ (Ctrl+C to stop)")
+        
+        snapshot = self.snapshot_sources()
+        try:
+            while True:
+                time.sleep(interval)
+                current = self.snapshot_sources()
+                changed = {path for path in snapshot.keys() | current.keys()
+                           if snapshot.get(path) != current.get(path)}
+                snapshot = current
+                if not changed:
+                    continue
+                
+                start = time.perf_counter()
+                try:
+                    blogs, writeups = self.rebuild_changes(changed, blogs, writeups)
+                finally:
+                    self.close()
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.build_id += 1
+                print(f"Rebuilt {len(changed)} changed file(s) in {elapsed_ms:.0f} ms: "
+                      f"{', '.join(sorted(changed))}")
+        except KeyboardInterrupt:
+            print("Stopping preview server")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+# Cold-start cost of this module; heavy dependencies are imported by the stages that need them
+MODULE_LOAD_SECONDS = time.perf_counter() - MODULE_LOAD_START
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the NYX portfolio website")
+    parser.add_argument('command', nargs='?', choices=['build', 'serve'], default='build',
+                        help="build the site once (default) or serve it with live rebuilds")
+    subset = parser.add_mutually_exclusive_group()
+    subset.add_argument('--only', action='append', metavar='PATH',
+                        help="build only this post (e.g. Writeups/<slug>); repeatable. "
+                             "Listings, sitemap and search index are left untouched")
+    subset.add_argument('--pages-only', action='store_true',
+                        help="rebuild the home page, listings, archives, static pages and feeds only")
+    subset.add_argument('--sitemap-only', action='store_true',
+                        help="rebuild the sitemap files and robots.txt only")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="re-parse every post and leave the build cache untouched")
+    parser.add_argument('--clean', action='store_true',
+                        help=f"delete the {CACHE_DIR_NAME}/ build cache before building")
+    parser.add_argument('--jobs', '-j', type=int, default=None, metavar='N',
+                        help="worker processes for rendering posts (default or 0: CPU count)")
+    parser.add_argument('--no-images', action='store_true',
+                        help="skip responsive image variants and <img> rewriting")
+    parser.add_argument('--no-search', action='store_true',
+                        help="skip building the client-side search index")
+    parser.add_argument('--no-related', action='store_true',
+                        help="skip related-post suggestions on post pages (prev/next links are kept)")
+    parser.add_argument('--page-size', type=int, default=12, metavar='N',
+                        help="posts per page on listing and archive pages (default: 12)")
+    parser.add_argument('--port', type=int, default=8000,
+                        help="port for the serve command (default: 8000)")
+    parser.add_argument('--highlight-cache-mb', type=int, default=64, metavar='MB',
+                        help="size limit of the syntax-highlighting cache (default: 64)")
+    parser.add_argument('--no-asset-pipeline', action='store_true',
+                        help="link assets/style.css as-is instead of a minified, fingerprinted copy")
+    parser.add_argument('--self-host-fonts', action='store_true',
+                        help="vendor the used Font Awesome icons and Google Fonts weights into assets/_build/")
+    parser.add_argument('--highlight-inline', action='store_true',
+                        help="inline each code page's highlight CSS instead of linking a shared stylesheet "
+                             "(for single-file exports)")
+    parser.add_argument('--code-fragment-kb', type=int, default=CODE_FRAGMENT_KB, metavar='KB',
+                        help="move rendered code blocks larger than this into fragments loaded on demand, "
+                             f"leaving a preview in the page (default: {CODE_FRAGMENT_KB}; 0 disables)")
+    parser.add_argument('--out', metavar='DIR',
+                        help="write the site into a separate directory (e.g. dist/) instead of in place")
+    parser.add_argument('--base-url', metavar='URL',
+                        help="absolute site URL for the sitemap and feeds (default: https:// plus the CNAME domain)")
+    parser.add_argument('--no-compress', action='store_true',
+                        help="skip writing precompressed .gz/.br siblings of text outputs")
+    parser.add_argument('--profile', action='store_true',
+                        help="time each build stage and print the slowest stages and files, "
+                             "and list the inline CSS of every page")
+    parser.add_argument('--profile-top', type=int, default=10, metavar='N',
+                        help="number of slowest files listed by --profile (default: 10)")
+    parser.add_argument('--profile-trace', metavar='FILE',
+                        help="also write a Chrome trace-event JSON file (implies --profile)")
+    args = parser.parse_args()
+    profile = args.profile or bool(args.profile_trace)
+    if args.jobs is not None and args.jobs < 0:
+        parser.error("--jobs must be 0 (CPU count) or a positive number of workers")
+    if args.command == 'serve' and (args.only or args.pages_only or args.sitemap_only):
+        parser.error("--only, --pages-only and --sitemap-only apply to the build command")
+    if profile:
+        print(f"Startup: main.py imported in {MODULE_LOAD_SECONDS * 1000:.0f} ms")
+
+    generator = PortfolioGenerator(use_cache=not args.no_cache, jobs=args.jobs,
+                                   highlight_cache=not args.no_cache,
+                                   highlight_cache_bytes=args.highlight_cache_mb * 1024 * 1024,
+                                   optimize_images=not args.no_images,
+                                   search_index=not args.no_search,
+                                   page_size=args.page_size,
+                                   profile=profile,
+                                   asset_pipeline=not args.no_asset_pipeline,
+                                   self_host_fonts=args.self_host_fonts,
+                                   compress=not args.no_compress,
+                                   output_dir=args.out,
+                                   highlight_inline=args.highlight_inline,
+                                   code_fragment_kb=args.code_fragment_kb,
+                                   related_posts=not args.no_related,
+                                   base_url=args.base_url)
+    if args.clean:
+        generator.cache.clean()
+    if args.command == 'serve':
+        generator.serve(port=args.port)
+    else:
+        if args.only:
+            generator.generate_post_subset(args.only)
+        elif args.pages_only:
+            generator.generate_listing_pages()
+        elif args.sitemap_only:
+            generator.generate_sitemap_only()
+        else:
+            generator.generate_all_pages()
+        if profile:
+            generator.profiler.report(top=args.profile_top)
+        if args.profile_trace:
+            generator.profiler.write_trace(args.profile_trace)
+
 
 if __name__ == "__main__":
-    generator = PortfolioGenerator()
-    generator.generate_all_pages()
+    main()
@@ -0,0 +1,409 @@
+"""
+Fingerprinted stylesheet, per-page critical CSS and self-hosted fonts.
+
+Imported only when the asset pipeline is on; fontTools, when installed, is
+imported the first time a font has to be subset.
+"""
+
+import hashlib
+import html
+import io
+import os
+import posixpath
+import re
+from importlib.util import find_spec
+from pathlib import Path
+from urllib.parse import unquote, urljoin
+
+from nyx_files import write_if_changed
+
+FONTTOOLS_AVAILABLE = find_spec('fontTools') is not None
+
+CSS_STRING_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_URL_RE = re.compile(r'''url\((['"]?)(?!data:|[a-z]+://|/|#)([^'")]+)\1\)''')
+CSS_FONT_FAMILY_RE = re.compile(r'''font-family:\s*(['"]?)([^;'"}]+)\1''')
+CSS_FONT_WEIGHT_RE = re.compile(r'font-weight:\s*(\d{3}|bold|normal)')
+CSS_WEIGHT_NAMES = {'normal': '400', 'bold': '700'}
+HTML_CLASS_ID_RE = re.compile(r'\b(?:class|id)="([^"]*)"')
+# Grouping at-rules whose blocks hold ordinary rules
+CSS_GROUPING_RULES = ('@media', '@supports', '@layer', '@container')
+STYLESHEET_LINK_RE = re.compile(r'<link\b[^>]*href="\{\{root\}\}assets/style\.css"[^>]*>')
+FONT_STYLESHEET_RE = re.compile(
+    r'\s*<link\b[^>]*href="(https://(?:fonts\.googleapis\.com/|cdnjs\.cloudflare\.com/ajax/libs/font-awesome/)[^"]*)"[^>]*>')
+FONT_PRECONNECT_RE = re.compile(r'\s*<link\b[^>]*rel="preconnect"[^>]*href="https://fonts\.(?:googleapis|gstatic)\.com"[^>]*>')
+# Google Fonts only serves WOFF2 to browsers it recognises
+FONT_FETCH_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                         "(KHTML, like Gecko) Chrome/120.0 Safari/537.36")
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet, leaving strings intact"""
+    parts = CSS_STRING_RE.split(css)
+    for index in range(0, len(parts), 2):
+        part = CSS_COMMENT_RE.sub('', parts[index])
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        part = re.sub(r':\s+', ':', part)
+        parts[index] = part.replace(';}', '}')
+    return "".join(parts).strip()
+
+
+def rebase_css_urls(css, prefix):
+    """Prefix every relative url() in css with prefix, folding the ../ segments this creates"""
+    def rebase(match):
+        quote_char, url = match.groups()
+        return f'url({quote_char}{posixpath.normpath(prefix + url)}{quote_char})'
+    return CSS_URL_RE.sub(rebase, css)
+
+
+def parse_css(css):
+    """Split minified CSS into (prelude, body) nodes; grouping at-rules get a list of child nodes"""
+    nodes = []
+    index = 0
+    length = len(css)
+    while index < length:
+        # Find the end of the prelude, skipping over strings
+        start = index
+        while index < length and css[index] not in '{;':
+            if css[index] in '"\'':
+                index = CSS_STRING_RE.match(css, index).end()
+            else:
+                index += 1
+        prelude = css[start:index].strip()
+        if index >= length or css[index] == ';':
+            # Statement at-rule such as @import or @charset
+            if prelude:
+                nodes.append((prelude, None))
+            index += 1
+            continue
+        
+        # Find the matching closing brace
+        depth = 0
+        body_start = index + 1
+        while index < length:
+            char = css[index]
+            if char in '"\'':
+                index = CSS_STRING_RE.match(css, index).end()
+                continue
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            index += 1
+        body = css[body_start:index]
+        index += 1
+        if prelude.lower().startswith(CSS_GROUPING_RULES):
+            nodes.append((prelude, parse_css(body)))
+        else:
+            nodes.append((prelude, body))
+    return nodes
+
+
+def serialize_css(nodes):
+    """Inverse of parse_css"""
+    output = []
+    for prelude, body in nodes:
+        if body is None:
+            output.append(f"{prelude};")
+        elif isinstance(body, list):
+            output.append(f"{prelude}{{{serialize_css(body)}}}")
+        else:
+            output.append(f"{prelude}{{{body}}}")
+    return "".join(output)
+
+
+def selector_tokens(selector):
+    """Class and id names a selector requires, ignoring pseudo-class arguments and attributes"""
+    selector = re.sub(r'\([^)]*\)|\[[^\]]*\]', '', selector)
+    return re.findall(r'[.#](-?[_a-zA-Z][-\w]*)', selector)
+
+
+def prune_css(nodes, keep_selector):
+    """Keep the selectors (and the rules still holding any) for which keep_selector is true.
+
+    @font-face and @keyframes rules are kept only when the pruned CSS still
+    references their family or animation name.
+    """
+    kept = []
+    deferred = []
+    for prelude, body in nodes:
+        if body is None:
+            kept.append((prelude, body))
+        elif isinstance(body, list):
+            children = prune_css(body, keep_selector)
+            if children:
+                kept.append((prelude, children))
+        elif prelude.startswith('@'):
+            deferred.append((len(kept), prelude, body))
+            kept.append(None)
+        else:
+            selectors = [selector for selector in prelude.split(',') if keep_selector(selector)]
+            if selectors:
+                kept.append((",".join(selectors), body))
+    
+    if deferred:
+        referenced = serialize_css([node for node in kept if node])
+        for position, prelude, body in deferred:
+            if prelude.startswith('@font-face'):
+                family = CSS_FONT_FAMILY_RE.search(body)
+                if not family or family.group(2).strip() not in referenced:
+                    continue
+            elif prelude.startswith('@keyframes') and prelude.split(None, 1)[-1] not in referenced:
+                continue
+            kept[position] = (prelude, body)
+    return [node for node in kept if node]
+
+
+def page_tokens(html_content):
+    """Class and id names used in a chunk of HTML"""
+    tokens = set()
+    for value in HTML_CLASS_ID_RE.findall(html_content):
+        tokens.update(value.split())
+    return tokens
+
+
+class AssetPipeline:
+    """Minified, fingerprinted stylesheet with per-page critical CSS and optional self-hosted fonts"""
+
+    def __init__(self, base_dir, output_dir, cache_dir, self_host_fonts=False):
+        self.assets_dir = Path(base_dir) / "assets"
+        self.templates_dir = Path(base_dir) / "templates"
+        self.build_dir = Path(output_dir) / "assets" / "_build"
+        self.cache_dir = Path(cache_dir) / "remote"
+        self.self_host_fonts = self_host_fonts
+        self.ready = False
+        self.stylesheet_url = None
+        self.nodes = []
+        self.vendored_urls = set()
+        self.icon_codepoints = set()
+        self.source_bytes = 0
+        self.external_bytes = {}
+        self.critical = {}
+        self.page_bytes = {}
+
+    def build(self):
+        """Write assets/_build/style.<hash>.css (plus font subsets) and prepare critical CSS"""
+        with open(self.assets_dir / "style.css", 'r', encoding='utf-8') as f:
+            source = f.read()
+        self.source_bytes = len(source.encode('utf-8'))
+        
+        # url()s in style.css are written against assets/; the built copy lives one level down
+        missing = sorted({url for _, url in CSS_URL_RE.findall(source)
+                          if not (self.assets_dir / unquote(re.split(r'[?#]', url)[0])).is_file()})
+        if missing:
+            print(f"style.css references missing files: {', '.join(missing[:5])}"
+                  f"{' ...' if len(missing) > 5 else ''}")
+        font_css = self.vendor_fonts() if self.self_host_fonts else ""
+        css = minify_css(font_css) + rebase_css_urls(minify_css(source), "../")
+        digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+        filename = f"style.{digest}.css"
+        
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.build_dir / filename, css)
+        for stale in self.build_dir.glob("style.*.css"):
+            if stale.name != filename:
+                stale.unlink()
+        
+        self.stylesheet_url = f"assets/_build/{filename}"
+        self.nodes = parse_css(css)
+        self.critical = {}
+        self.page_bytes = {}
+        self.ready = True
+        print(f"Generated: {self.stylesheet_url} ({self.source_bytes / 1024:.1f} KB -> "
+              f"{len(css.encode('utf-8')) / 1024:.1f} KB minified)")
+
+    def rewrite_head(self, template_source):
+        """Point base.html at the fingerprinted stylesheet, loaded without blocking render"""
+        if not self.ready:
+            return template_source
+        href = "{{root}}" + self.stylesheet_url
+        links = ('{{critical_css}}\n'
+                 f'    <link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+                 f'    <noscript><link rel="stylesheet" href="{href}"></noscript>')
+        template_source = STYLESHEET_LINK_RE.sub(lambda match: links, template_source, count=1)
+        if self.vendored_urls:
+            template_source = FONT_STYLESHEET_RE.sub(
+                lambda match: '' if html.unescape(match.group(1)) in self.vendored_urls else match.group(0),
+                template_source)
+            if not FONT_STYLESHEET_RE.search(template_source):
+                template_source = FONT_PRECONNECT_RE.sub('', template_source)
+            # Drop comments that only introduced the removed links
+            template_source = re.sub(r'<!--[^>]*-->\s*(?=<!--)', '', template_source)
+        return template_source
+
+    def critical_css(self, above_fold_html, root):
+        """Inline <style> with the rules needed by the classes and ids above the fold"""
+        tokens = frozenset(page_tokens(above_fold_html))
+        css = self.critical.get(tokens)
+        if css is None:
+            # Print styles never affect the first paint
+            nodes = [node for node in self.nodes if node[0] != '@media print']
+            css = serialize_css(prune_css(
+                nodes, lambda selector: all(token in tokens for token in selector_tokens(selector))))
+            self.critical[tokens] = css
+        # Relative url()s are relative to assets/_build/, inline styles to the page
+        css = CSS_URL_RE.sub(lambda match: f'url({match.group(1)}{root}'
+                             f'{posixpath.normpath("assets/_build/" + match.group(2))}{match.group(1)})', css)
+        return f"<style>{css}</style>"
+
+    def record_page(self, page_path, inline_css):
+        """Remember the render-blocking bytes of a generated page for the report"""
+        self.page_bytes[str(page_path)] = len(inline_css.encode('utf-8'))
+
+    def report(self, verbose=False, top=3):
+        """Print render-blocking CSS before and after the pipeline, with the largest pages.
+
+        Every page is listed only when verbose (with --profile).
+        """
+        if not self.page_bytes:
+            return
+        external = self.external_stylesheets()
+        # Sizes of third-party stylesheets are only known once they have been fetched
+        before = f"{(self.source_bytes + sum(self.external_bytes.values())) / 1024:.1f} KB"
+        unknown = len(external - set(self.external_bytes))
+        if unknown:
+            before += f" + {unknown} external"
+        remaining = f" + {len(external - self.vendored_urls)} external" if external - self.vendored_urls else ""
+        sizes = sorted(self.page_bytes.values())
+        print(f"Render-blocking CSS: {before} -> {sizes[len(sizes) // 2] / 1024:.1f} KB inline{remaining} "
+              f"per page (median of {len(sizes)}, max {sizes[-1] / 1024:.1f} KB)")
+        pages = sorted(self.page_bytes.items(), key=lambda item: (-item[1], item[0]))
+        if verbose:
+            for page_path, inline_bytes in pages:
+                print(f"  {page_path}: {inline_bytes / 1024:.1f} KB inline")
+        else:
+            print("  Largest: " + ", ".join(f"{page_path} ({inline_bytes / 1024:.1f} KB)"
+                                            for page_path, inline_bytes in pages[:top]))
+
+    def external_stylesheets(self):
+        """Font and icon stylesheets base.html loads from other origins"""
+        base_template = self.templates_dir / "base.html"
+        if not base_template.exists():
+            return set()
+        source = base_template.read_text(encoding='utf-8')
+        return {html.unescape(url) for url in FONT_STYLESHEET_RE.findall(source)}
+
+    def fetch(self, url):
+        """Download url once and keep it under .nyx-cache/remote/ for offline rebuilds"""
+        cached_path = self.cache_dir / hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]
+        if cached_path.exists():
+            return cached_path.read_bytes()
+        from urllib.request import Request, urlopen
+        request = Request(url, headers={'User-Agent': FONT_FETCH_USER_AGENT})
+        with urlopen(request, timeout=30) as response:
+            data = response.read()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached_path.with_suffix('.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, cached_path)
+        return data
+
+    def template_tokens(self):
+        """Class names mentioned anywhere in the templates, including inline scripts"""
+        tokens = set()
+        for template_path in self.templates_dir.glob("*.html"):
+            tokens.update(re.findall(r'[-\w]+', template_path.read_text(encoding='utf-8')))
+        return tokens
+
+    def vendor_fonts(self):
+        """Self-host the font and icon stylesheets, keeping only what the site uses"""
+        fonts_dir = self.build_dir / "fonts"
+        fonts_dir.mkdir(parents=True, exist_ok=True)
+        self.vendored_urls = set()
+        self.external_bytes = {}
+        written = set()
+        output = []
+        for url in sorted(self.external_stylesheets()):
+            try:
+                css = self.fetch(url).decode('utf-8')
+                self.external_bytes[url] = len(css.encode('utf-8'))
+                if 'font-awesome' in url:
+                    css = self.subset_icon_css(css)
+                else:
+                    css = self.subset_webfont_css(css)
+                css = self.localize_font_urls(css, url, fonts_dir, written)
+            except (OSError, ValueError) as e:
+                print(f"Could not self-host {url}: {e}")
+                continue
+            self.vendored_urls.add(url)
+            output.append(css)
+        
+        # Drop font files from earlier builds that are no longer referenced
+        for stale in fonts_dir.iterdir():
+            if stale.name not in written:
+                stale.unlink()
+        if self.vendored_urls:
+            print(f"Self-hosted fonts: {len(self.vendored_urls)} stylesheets, {len(written)} font files")
+        return "".join(output)
+
+    def subset_icon_css(self, css):
+        """Font Awesome rules for the icons the templates use, plus their @font-face rules"""
+        used = self.template_tokens()
+        
+        def keep_selector(selector):
+            return all(token in used for token in selector_tokens(selector) if token.startswith('fa'))
+        
+        nodes = prune_css(parse_css(minify_css(css)), keep_selector)
+        self.icon_codepoints = {int(code, 16) for code in re.findall(r'content:"\\([0-9a-fA-F]{2,6})"',
+                                                                       serialize_css(nodes))}
+        return serialize_css(nodes)
+
+    def subset_webfont_css(self, css):
+        """Latin @font-face rules for the font weights style.css actually uses"""
+        with open(self.assets_dir / "style.css", 'r', encoding='utf-8') as f:
+            style = f.read()
+        weights = {'400'} | {CSS_WEIGHT_NAMES.get(weight, weight) for weight in CSS_FONT_WEIGHT_RE.findall(style)}
+        faces = []
+        # Google Fonts labels every @font-face with its unicode-range subset
+        for subset, face in re.findall(r'/\*\s*([\w-]+)\s*\*/\s*(@font-face\s*\{[^}]*\})', css):
+            weight = CSS_FONT_WEIGHT_RE.search(face)
+            if subset == 'latin' and (not weight or weight.group(1) in weights):
+                faces.append(face)
+        return minify_css("".join(faces))
+
+    def localize_font_urls(self, css, stylesheet_url, fonts_dir, written):
+        """Download the fonts a stylesheet references and point its url()s at local copies"""
+        nodes = parse_css(css)
+        for position, (prelude, body) in enumerate(nodes):
+            if not prelude.startswith('@font-face'):
+                continue
+            # Keep a single WOFF2 source; every browser that loads the async stylesheet supports it
+            sources = re.findall(r'''url\((['"]?)([^'")]+)\1\)(?:\s*format\(['"]?([\w-]+)['"]?\))?''', body)
+            source = next((src for src in sources if src[2] == 'woff2' or src[1].endswith('.woff2')), None)
+            if source is None:
+                continue
+            font_url = urljoin(stylesheet_url, source[1])
+            data = self.fetch(font_url)
+            if 'font-awesome' in stylesheet_url:
+                data = self.subset_font(data, self.icon_codepoints)
+            # Font files are named by content, so an existing file is already current
+            filename = f"{hashlib.sha256(data).hexdigest()[:12]}.woff2"
+            if not (fonts_dir / filename).exists():
+                (fonts_dir / filename).write_bytes(data)
+            written.add(filename)
+            src = f'src:url(fonts/{filename}) format("woff2")'
+            body = re.sub(r'src:[^;}]*', lambda match: src, body, count=1)
+            nodes[position] = (prelude, body)
+        return serialize_css(nodes)
+
+    def subset_font(self, data, codepoints):
+        """Keep only the glyphs for codepoints when fontTools (and brotli for WOFF2) is installed"""
+        if not (FONTTOOLS_AVAILABLE and codepoints):
+            return data
+        from fontTools import subset as font_subset
+        options = font_subset.Options()
+        options.flavor = 'woff2'
+        font = font_subset.load_font(io.BytesIO(data), options)
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        output = io.BytesIO()
+        try:
+            font_subset.save_font(font, output, options)
+        except ImportError:
+            # WOFF2 output needs brotli; serve the full font instead
+            return data
+        return output.getvalue()
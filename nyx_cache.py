@@ -0,0 +1,178 @@
+"""
+Persistent caches for parsed posts and highlighted code blocks.
+
+Both live under .nyx-cache/ and are consulted on every build; a disabled
+cache answers every lookup with a miss and stores nothing.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+# Bump whenever the rendering pipeline changes so cached posts are re-parsed
+GENERATOR_VERSION = "1.2"
+
+
+# Versions of the libraries that shape rendered HTML, read on first use
+LIBRARY_VERSIONS = {}
+
+
+def library_versions():
+    """Installed markdown and Pygments versions, from package metadata so neither gets imported"""
+    if not LIBRARY_VERSIONS:
+        from importlib.metadata import PackageNotFoundError, version
+        for name in ('markdown', 'pygments'):
+            try:
+                LIBRARY_VERSIONS[name] = version(name)
+            except PackageNotFoundError:
+                LIBRARY_VERSIONS[name] = None
+    return LIBRARY_VERSIONS
+
+
+class BuildCache:
+    """Persistent cache of parsed posts keyed by a hash of their source"""
+
+    def __init__(self, cache_dir, enabled=True):
+        self.cache_dir = Path(cache_dir)
+        self.posts_dir = self.cache_dir / "posts"
+        self.enabled = enabled
+        if self.enabled:
+            self.posts_dir.mkdir(parents=True, exist_ok=True)
+
+    def make_key(self, source_bytes, fingerprint):
+        """Build a cache key from the source bytes and pipeline fingerprint"""
+        digest = hashlib.sha256()
+        digest.update(GENERATOR_VERSION.encode('utf-8'))
+        # Upgrading markdown or Pygments changes the HTML they produce
+        digest.update(json.dumps(library_versions(), sort_keys=True).encode('utf-8'))
+        digest.update(fingerprint.encode('utf-8'))
+        digest.update(source_bytes)
+        return digest.hexdigest()
+
+    def load_entry(self, key):
+        """Return the {'metadata', 'excerpt'} record of a cached post, or None on a miss"""
+        if not self.enabled:
+            return None
+        try:
+            with open(self.posts_dir / f"{key}.json", 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Entries written before excerpts were cached count as misses
+        if not isinstance(entry.get('excerpt'), str):
+            return None
+        return entry
+
+    def load_excerpt(self, key):
+        """Return the excerpt of a cached post without reading its body, or None on a miss"""
+        entry = self.load_entry(key)
+        return entry['excerpt'] if entry else None
+
+    def load(self, key):
+        """Return (metadata, html, excerpt) for a cached post, or None on a miss"""
+        entry = self.load_entry(key)
+        if entry is None:
+            return None
+        try:
+            with open(self.posts_dir / f"{key}.html", 'r', encoding='utf-8') as f:
+                html_content = f.read()
+        except OSError:
+            return None
+        return entry['metadata'], html_content, entry['excerpt']
+
+    def store(self, key, metadata, html_content, excerpt):
+        """Save a parsed post and its listing excerpt to the cache"""
+        if not self.enabled:
+            return
+        # Write the HTML first so a metadata file never points at a missing body
+        with open(self.posts_dir / f"{key}.html", 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        with open(self.posts_dir / f"{key}.json", 'w', encoding='utf-8') as f:
+            json.dump({'metadata': metadata, 'excerpt': excerpt}, f)
+
+    def prune(self, keep_keys):
+        """Drop cached posts that were not used by the current build"""
+        if not self.enabled:
+            return
+        for entry in self.posts_dir.iterdir():
+            if entry.stem not in keep_keys:
+                entry.unlink()
+
+    def clean(self):
+        """Remove every cached entry"""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+        if self.enabled:
+            self.posts_dir.mkdir(parents=True, exist_ok=True)
+
+
+class HighlightCache:
+    """Size-bounded disk cache of Pygments output shared across posts and runs"""
+
+    def __init__(self, cache_dir, enabled=True, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) / "highlight"
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, lexer_name, code, options):
+        """Build a key from the Pygments version, the lexer name, the code text and formatter options"""
+        digest = hashlib.sha256()
+        # Lexers and formatters change their output between Pygments releases
+        digest.update(json.dumps([library_versions()['pygments'], lexer_name, options],
+                                 sort_keys=True, default=str).encode('utf-8'))
+        digest.update(code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.html"
+
+    def get(self, key):
+        """Return cached highlighted HTML, or None on a miss"""
+        path = self.entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                html_content = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        # Refresh the mtime so eviction drops the least recently used entries first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return html_content
+
+    def put(self, key, html_content):
+        """Store highlighted HTML; safe when several workers write concurrently"""
+        path = self.entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        os.replace(temp_path, path)
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes"""
+        if not self.enabled or not self.cache_dir.exists():
+            return 0
+        entries = []
+        total_bytes = 0
+        for path in self.cache_dir.glob("*/*.html"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+        
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink()
+            total_bytes -= size
+            removed += 1
+        return removed
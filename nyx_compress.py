@@ -0,0 +1,103 @@
+"""
+Precompressed .gz and .br siblings for text outputs.
+
+Imported only when precompression is on; brotli is optional.
+"""
+
+import gzip
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from pathlib import Path
+
+from nyx_files import PRECOMPRESS_ENCODINGS, write_if_changed
+
+BROTLI_AVAILABLE = find_spec('brotli') is not None
+
+# Text outputs that get precompressed siblings
+PRECOMPRESS_SUFFIXES = ('.html', '.css', '.svg', '.xml', '.json', '.js')
+
+
+class Precompressor:
+    """Writes maximum-compression .gz (and .br when brotli is installed) siblings for text outputs"""
+
+    def __init__(self, cache_dir, output_dir, jobs=1):
+        # One manifest per output directory, so a full build only prunes its own siblings
+        output_key = hashlib.sha256(str(Path(output_dir).resolve()).encode('utf-8')).hexdigest()[:12]
+        self.manifest_path = Path(cache_dir) / f"compress-{output_key}.json"
+        self.jobs = jobs
+        self.encoders = {'.gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+        if BROTLI_AVAILABLE:
+            self.encoders['.br'] = self.encode_brotli
+
+    def encode_brotli(self, data):
+        import brotli
+        return brotli.compress(data, quality=11)
+
+    def compress_file(self, path, previous):
+        """Compress one file unless it matches the previous build; returns its manifest entry"""
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if (previous and previous['sha256'] == digest and previous['sizes'].keys() == self.encoders.keys()
+                and all(size is None or self.sibling(path, suffix).exists()
+                        for suffix, size in previous['sizes'].items())):
+            return dict(previous, updated=False)
+        
+        sizes = {}
+        for suffix, encode in self.encoders.items():
+            sibling = self.sibling(path, suffix)
+            compressed = encode(data)
+            if len(compressed) < len(data):
+                sibling.write_bytes(compressed)
+                sizes[suffix] = len(compressed)
+            else:
+                # Not worth serving; let the server fall back to the original
+                sibling.unlink(missing_ok=True)
+                sizes[suffix] = None
+        return {'sha256': digest, 'bytes': len(data), 'sizes': sizes, 'updated': True}
+
+    def sibling(self, path, suffix):
+        return path.with_name(path.name + suffix)
+
+    def run(self, paths, full=True):
+        """Precompress the text files among paths in a thread pool and print a ratio summary.
+
+        Only files the build produced are passed in, so sources next to in-place
+        outputs are never touched. A full build passes every output and drops the
+        siblings of files it no longer produces; partial builds pass the paths
+        they wrote and keep the rest of the manifest.
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        
+        outputs = [Path(path) for path in sorted(map(str, paths)) if path.endswith(PRECOMPRESS_SUFFIXES)]
+        keys = [path.as_posix() for path in outputs]
+        # zlib and brotli release the GIL, so threads compress in parallel
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            entries = list(executor.map(self.compress_file, outputs, [manifest.get(key) for key in keys]))
+        
+        updated = sum(entry.pop('updated') for entry in entries)
+        if full:
+            # Remove siblings of files earlier builds compressed but this one no longer produces
+            for key in manifest.keys() - set(keys):
+                for suffix in PRECOMPRESS_ENCODINGS:
+                    self.sibling(Path(key), suffix).unlink(missing_ok=True)
+            manifest = {}
+        manifest.update(zip(keys, entries))
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.manifest_path, json.dumps(manifest, sort_keys=True))
+        
+        original = sum(entry['bytes'] for entry in entries)
+        if not original:
+            return
+        ratios = []
+        for suffix in self.encoders:
+            compressed = sum(entry['sizes'][suffix] or entry['bytes'] for entry in entries)
+            label = {'.gz': 'gzip', '.br': 'brotli'}[suffix]
+            ratios.append(f"{compressed / 1024:.0f} KB {label} ({100 * compressed / original:.0f}%)")
+        print(f"Precompressed: {len(entries)} files ({updated} updated), "
+              f"{original / 1024:.0f} KB -> {', '.join(ratios)}")
@@ -0,0 +1,101 @@
+"""
+File helpers shared by the generator and its build pipelines.
+
+Outputs are only rewritten when their content changes, so unchanged pages
+keep their mtime and incremental deploys stay small.
+"""
+
+import filecmp
+import hashlib
+import os
+import shutil
+from functools import partial
+from pathlib import Path
+
+# Precompressed siblings written next to text outputs
+PRECOMPRESS_ENCODINGS = ('.gz', '.br')
+
+
+def write_if_changed(path, content):
+    """Write text to path unless it already holds exactly that content.
+
+    The new content goes to a temporary file that is renamed over path, so
+    readers never see a half-written file and unchanged files keep their mtime.
+    """
+    path = Path(path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except (OSError, ValueError):
+        pass
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
+
+
+class StreamingFileWriter:
+    """Streams text into a temporary file that replaces path on close only if the content changed.
+
+    Large outputs never have to be held in memory, and unchanged files keep
+    their mtime just as with write_if_changed.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.tmp_path, 'w', encoding='utf-8', newline='\n')
+        self.changed = False
+
+    def write(self, text):
+        self.file.write(text)
+
+    def close(self):
+        """Finish the file; returns True when path was rewritten"""
+        self.file.close()
+        if self.path.is_file() and filecmp.cmp(self.tmp_path, self.path, shallow=False):
+            self.tmp_path.unlink()
+            self.changed = False
+        else:
+            os.replace(self.tmp_path, self.path)
+            self.changed = True
+        return self.changed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+            self.tmp_path.unlink(missing_ok=True)
+
+
+def copy_if_changed(source, target):
+    """Atomically copy source to target unless target already holds the same bytes"""
+    source, target = Path(source), Path(target)
+    try:
+        source_stat, target_stat = source.stat(), target.stat()
+        if source_stat.st_size == target_stat.st_size and (
+                source_stat.st_mtime_ns == target_stat.st_mtime_ns or source.read_bytes() == target.read_bytes()):
+            return False
+    except OSError:
+        pass
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, target)
+    return True
+
+
+def file_sha256(path):
+    """Hex SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(partial(f.read, 1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
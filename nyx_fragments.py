@@ -0,0 +1,105 @@
+"""
+Oversized code blocks moved out of post pages into fragments loaded on demand.
+
+Imported only when --code-fragment-kb is above zero.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+from nyx_files import write_if_changed
+
+# Rendered code blocks, highlighted by Pygments or plain fenced_code output
+CODE_BLOCK_RE = re.compile(r'<div class="highlight"><pre>.*?</pre></div>|<pre><code[^>]*>.*?</code></pre>', re.DOTALL)
+CODE_PREVIEW_LINES = 20
+
+
+def code_preview(block, lines):
+    """First lines of a rendered code block with open spans closed, and its total line count.
+
+    Returns (None, total) when the block is not longer than lines.
+    """
+    start = block.index('>', block.index('<code')) + 1
+    end = block.rindex('</code>')
+    body = block[start:end]
+    total = body.count('\n') + (not body.endswith('\n'))
+    position = -1
+    for _ in range(lines):
+        position = body.find('\n', position + 1)
+        if position == -1:
+            return None, total
+    head = body[:position + 1]
+    # Pygments spans can run across lines (docstrings, block comments)
+    open_spans = head.count('<span') - head.count('</span>')
+    return block[:start] + head + '</span>' * open_spans + block[end:], total
+
+
+class CodeFragments:
+    """Moves rendered code blocks above a size threshold into content-addressed fragment files.
+
+    The page keeps a short preview and a link that assets/code-fragments.js
+    swaps for the full block; without JavaScript the link opens the fragment.
+    """
+
+    def __init__(self, build_dir, threshold_bytes, preview_lines=CODE_PREVIEW_LINES):
+        self.fragments_dir = Path(build_dir) / "code"
+        self.threshold_bytes = threshold_bytes
+        self.preview_lines = preview_lines
+        self.reset()
+
+    def reset(self):
+        self.paths = set()
+        self.pages = 0
+        self.blocks = 0
+        self.original_bytes = 0
+        self.preview_bytes = 0
+
+    def offload(self, content, root):
+        """Replace oversized code blocks in post HTML; returns (html, number of blocks moved)"""
+        if not self.threshold_bytes or len(content) < self.threshold_bytes:
+            return content, 0
+        moved = 0
+        
+        def replace_block(match):
+            nonlocal moved
+            block = match.group(0)
+            size = len(block.encode('utf-8'))
+            if size < self.threshold_bytes:
+                return block
+            preview, total = code_preview(block, self.preview_lines)
+            if preview is None:
+                # A few very long lines; nothing useful to preview
+                preview = ""
+            
+            # Named by content, so unchanged blocks are never rewritten and repeats share a file
+            name = f"{hashlib.sha256(block.encode('utf-8')).hexdigest()[:16]}.html"
+            path = self.fragments_dir / name
+            if path not in self.paths and not path.is_file():
+                self.fragments_dir.mkdir(parents=True, exist_ok=True)
+                write_if_changed(path, block)
+            self.paths.add(path)
+            
+            replacement = (f'<div class="code-fragment">{preview}'
+                           f'<a class="code-expand" href="{root}assets/_build/code/{name}">'
+                           f'Show all {total} lines ({size / 1024:.0f} KB)</a></div>')
+            moved += 1
+            self.original_bytes += size
+            self.preview_bytes += len(replacement.encode('utf-8'))
+            return replacement
+        
+        content = CODE_BLOCK_RE.sub(replace_block, content)
+        if moved:
+            self.pages += 1
+            self.blocks += moved
+        return content, moved
+
+    def finish(self, full):
+        """Report what was offloaded; full builds also delete fragments no page uses any more"""
+        if full and self.fragments_dir.is_dir():
+            for stale in self.fragments_dir.glob("*.html"):
+                if stale not in self.paths:
+                    stale.unlink()
+        if self.blocks:
+            print(f"Code fragments: {self.blocks} blocks from {self.pages} pages moved out, "
+                  f"{self.original_bytes / 1024:.0f} KB -> {self.preview_bytes / 1024:.0f} KB inline")
@@ -0,0 +1,149 @@
+"""
+Code highlighting stylesheet holding only the token classes posts use.
+
+Imported only when Pygments is installed, since nothing is highlighted
+without it.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from nyx_assets import minify_css
+from nyx_files import write_if_changed
+
+# Pygments style the generated highlight stylesheet is built from
+HIGHLIGHT_STYLE = 'monokai'
+HIGHLIGHT_BLOCK_RE = re.compile(r'<div class="highlight"><pre>(.*?)</pre></div>', re.DOTALL)
+HIGHLIGHT_SPAN_RE = re.compile(r'<span class="([\w-]+)">')
+HIGHLIGHT_RULE_RE = re.compile(r'^(\.highlight \.([\w-]+) \{[^}]*\})', re.MULTILINE)
+
+
+class HighlightStylesheet:
+    """Token colors for highlighted code, pruned to the classes rendered posts use.
+
+    Pages with code link one shared assets/_build/highlight.<hash>.css (or inline
+    their own rules). The class set of the previous build is kept in the cache so
+    pages can link the final stylesheet while they are streamed out; pages
+    written before the set grew are pointed at the new file afterwards.
+    """
+
+    def __init__(self, build_dir, cache_dir, style=HIGHLIGHT_STYLE, inline=False):
+        self.build_dir = Path(build_dir)
+        self.record_path = Path(cache_dir) / "highlight-css.json"
+        self.style = style
+        self.inline = inline
+        self.rules = None
+        self.inline_css = {}
+        self.classes = set()
+        self.filename = None
+        self.seen = set()
+        self.pages = {}
+        self.written = False
+
+    def load(self):
+        """Start a build from the class set and stylesheet of the previous one"""
+        self.classes = set()
+        self.filename = None
+        self.seen = set()
+        self.pages = {}
+        self.written = False
+        if self.inline:
+            return
+        try:
+            with open(self.record_path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return
+        if record.get('style') != self.style:
+            return
+        self.classes = set(record.get('classes', []))
+        filename = record.get('filename')
+        if filename and (self.build_dir / filename).is_file():
+            self.filename = filename
+
+    def theme_rules(self):
+        """Minified rule for every token class of the style, in theme order"""
+        if self.rules is None:
+            from pygments.formatters import HtmlFormatter
+            style_defs = HtmlFormatter(style=self.style).get_style_defs('.highlight')
+            self.rules = {match.group(2): minify_css(match.group(1))
+                          for match in HIGHLIGHT_RULE_RE.finditer(style_defs)}
+        return self.rules
+
+    def stylesheet(self, classes):
+        """CSS for the given token classes"""
+        return "".join(rule for name, rule in self.theme_rules().items() if name in classes)
+
+    def page_classes(self, content):
+        """Token classes used by the highlighted code blocks in rendered post HTML"""
+        classes = set()
+        for block in HIGHLIGHT_BLOCK_RE.findall(content):
+            classes.update(HIGHLIGHT_SPAN_RE.findall(block))
+        return classes
+
+    def head_html(self, classes, root, page_path):
+        """Stylesheet link (or inline <style>) for a page whose code uses classes; empty without code"""
+        if not classes:
+            return ""
+        self.seen |= classes
+        if self.inline:
+            key = frozenset(classes)
+            css = self.inline_css.get(key)
+            if css is None:
+                css = self.inline_css[key] = self.stylesheet(classes)
+            return f"<style>{css}</style>"
+        
+        if self.filename is None or not classes <= self.classes:
+            self.classes |= classes
+            self.write()
+        self.pages[page_path] = self.filename
+        return f'<link rel="stylesheet" href="{root}assets/_build/{self.filename}">'
+
+    def write(self):
+        """Write the stylesheet for the current class set under a content hash"""
+        css = self.stylesheet(self.classes)
+        self.filename = f"highlight.{hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]}.css"
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.build_dir / self.filename, css)
+        self.written = True
+
+    def finish(self, full):
+        """Settle the stylesheet once post pages are written and repoint pages that link an older one.
+
+        A full build shrinks the stylesheet to the classes it saw and deletes old
+        ones; partial builds only ever add classes, since other pages still link them.
+        """
+        if full and not self.inline and self.seen != self.classes:
+            self.classes = set(self.seen)
+            if self.classes:
+                self.write()
+            else:
+                self.filename = None
+        
+        repointed = 0
+        for page_path, filename in self.pages.items():
+            if filename != self.filename:
+                content = page_path.read_text(encoding='utf-8')
+                write_if_changed(page_path, content.replace(f"assets/_build/{filename}",
+                                                            f"assets/_build/{self.filename}"))
+                self.pages[page_path] = self.filename
+                repointed += 1
+        if full:
+            for stale in self.build_dir.glob("highlight.*.css"):
+                if stale.name != self.filename:
+                    stale.unlink()
+        if self.inline:
+            return
+        
+        self.record_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.record_path, json.dumps(
+            {'style': self.style, 'classes': sorted(self.classes), 'filename': self.filename}, sort_keys=True))
+        if self.written:
+            rules = self.theme_rules()
+            size = len(self.stylesheet(self.classes).encode('utf-8'))
+            full_size = len(self.stylesheet(rules).encode('utf-8'))
+            print(f"Generated: assets/_build/{self.filename} ({len(self.classes & rules.keys())} of "
+                  f"{len(rules)} {self.style} token classes, {size / 1024:.1f} KB of {full_size / 1024:.1f} KB"
+                  f"{f', {repointed} pages repointed' if repointed else ''})")
@@ -0,0 +1,246 @@
+"""
+Responsive variants for images referenced from post pages.
+
+Imported only when image optimization is on; Pillow itself is imported the
+first time an image actually has to be resized.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import threading
+from importlib.util import find_spec
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+PILLOW_AVAILABLE = find_spec('PIL') is not None
+
+IMG_TAG_RE = re.compile(r'<img\b([^>]*?)\s*/?>')
+HTML_ATTRIBUTE_RE = re.compile(r'([\w-]+)="([^"]*)"')
+# Widths of the downscaled variants generated for post images
+IMAGE_VARIANT_WIDTHS = (480, 960, 1440)
+IMAGE_SIZES_ATTRIBUTE = "(max-width: 960px) 100vw, 960px"
+# Bump when variant encoding settings change so cached variants are rebuilt
+IMAGE_PIPELINE_VERSION = "1"
+
+
+def read_image_size(path):
+    """Read (width, height) from a PNG, GIF or JPEG header without Pillow"""
+    with open(path, 'rb') as f:
+        head = f.read(26)
+        if head[:8] == b'\x89PNG\r\n\x1a\n':
+            return int.from_bytes(head[16:20], 'big'), int.from_bytes(head[20:24], 'big')
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return int.from_bytes(head[6:8], 'little'), int.from_bytes(head[8:10], 'little')
+        if head[:2] == b'\xff\xd8':
+            # Walk JPEG segments until a start-of-frame marker
+            f.seek(2)
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                length = int.from_bytes(f.read(2), 'big')
+                if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                    frame = f.read(5)
+                    return int.from_bytes(frame[3:5], 'big'), int.from_bytes(frame[1:3], 'big')
+                f.seek(length - 2, 1)
+    return None
+
+
+class ImageOptimizer:
+    """Generates downscaled and modern-format image variants, cached by source hash"""
+
+    # Pillow format name and file extension for each supported output format
+    FORMATS = {
+        'png': ('PNG', 'png'),
+        'jpeg': ('JPEG', 'jpg'),
+        'webp': ('WEBP', 'webp'),
+        'avif': ('AVIF', 'avif'),
+    }
+    SOURCE_FORMATS = {'.png': 'png', '.jpg': 'jpeg', '.jpeg': 'jpeg'}
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir) / "images"
+        # Detected on first use so builds without images never import Pillow
+        self.modern_formats = None
+        self.info = {}
+        self.lock = threading.Lock()
+
+    def load_pillow(self):
+        """Import Pillow and detect the modern formats it can encode, once"""
+        with self.lock:
+            if self.modern_formats is None:
+                self.modern_formats = []
+                if PILLOW_AVAILABLE:
+                    from PIL import features
+                    # Prefer AVIF, then WebP, depending on what this Pillow build can encode
+                    self.modern_formats = [name for name in ('avif', 'webp') if features.check(name)]
+        return self.modern_formats
+
+    def local_sources(self, html_content):
+        """src of every <img> in post HTML that points at a file next to the post"""
+        for match in IMG_TAG_RE.finditer(html_content):
+            src = dict(HTML_ATTRIBUTE_RE.findall(match.group(1))).get('src', '')
+            if src and not re.match(r'^(?:[a-z]+:|//|/)', src):
+                yield src
+
+    def image_info(self, source_path, output_dir):
+        """Return size and variant details for an image, generating variants as needed"""
+        source_path = Path(source_path)
+        try:
+            stat = source_path.stat()
+        except OSError:
+            return None
+        self.load_pillow()
+        memo_key = (str(source_path), str(output_dir), stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            if memo_key in self.info:
+                return self.info[memo_key]
+        
+        info = self.build_variants(source_path, Path(output_dir), stat.st_size)
+        with self.lock:
+            self.info[memo_key] = info
+        return info
+
+    def build_variants(self, source_path, output_dir, source_bytes):
+        """Create variants for one image under output_dir/_optimized/"""
+        try:
+            size = read_image_size(source_path)
+        except OSError:
+            size = None
+        info = {'size': size, 'bytes': source_bytes, 'variants': {}}
+        source_format = self.SOURCE_FORMATS.get(source_path.suffix.lower())
+        if not (PILLOW_AVAILABLE and size and source_format):
+            return info
+        
+        with open(source_path, 'rb') as f:
+            source_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+        
+        width, height = size
+        targets = []
+        for variant_width in IMAGE_VARIANT_WIDTHS:
+            if variant_width < width:
+                targets.append((source_format, variant_width))
+        # Modern formats also get a copy at the full (capped) width
+        for format_name in self.modern_formats:
+            for variant_width in IMAGE_VARIANT_WIDTHS + (width,):
+                if variant_width <= min(width, IMAGE_VARIANT_WIDTHS[-1]):
+                    targets.append((format_name, variant_width))
+        
+        image = None
+        variants_dir = output_dir / "_optimized"
+        for format_name, variant_width in sorted(set(targets)):
+            pil_format, extension = self.FORMATS[format_name]
+            filename = f"{source_hash}-{variant_width}w.{extension}"
+            cached_path = self.cache_dir / f"{IMAGE_PIPELINE_VERSION}-{filename}"
+            
+            if not cached_path.exists():
+                if image is None:
+                    from PIL import Image
+                    image = Image.open(source_path)
+                    image.load()
+                self.encode_variant(image, variant_width, pil_format, cached_path)
+            
+            variant_bytes = cached_path.stat().st_size
+            if variant_bytes >= source_bytes:
+                # Downscaled screenshots can re-encode larger than the original
+                continue
+            info['variants'].setdefault(format_name, []).append(
+                (variant_width, f"_optimized/{filename}", variant_bytes))
+        
+        # A modern format whose variants stop short of the image's (capped) width would make
+        # wide viewports pick a blurry file, so the <img> fallback is used instead
+        for format_name in self.modern_formats:
+            entries = info['variants'].get(format_name)
+            if entries and max(entry[0] for entry in entries) < min(width, IMAGE_VARIANT_WIDTHS[-1]):
+                del info['variants'][format_name]
+        
+        for entries in info['variants'].values():
+            for _, path, variant_bytes in entries:
+                output_path = output_dir / path
+                if not output_path.exists() or output_path.stat().st_size != variant_bytes:
+                    variants_dir.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(self.cache_dir / f"{IMAGE_PIPELINE_VERSION}-{output_path.name}", output_path)
+        return info
+
+    def encode_variant(self, image, width, pil_format, cached_path):
+        """Resize and encode one variant into the cache"""
+        from PIL import Image
+        height = max(1, round(image.height * width / image.width))
+        variant = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        if pil_format == 'JPEG' and variant.mode not in ('RGB', 'L'):
+            variant = variant.convert('RGB')
+        options = {
+            'PNG': {},
+            'JPEG': {'quality': 82, 'optimize': True, 'progressive': True},
+            'WEBP': {'quality': 80, 'method': 4},
+            'AVIF': {'quality': 60, 'speed': 8},
+        }[pil_format]
+        
+        cached_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cached_path.with_name(f"{cached_path.name}.{threading.get_ident()}.tmp")
+        variant.save(temp_path, pil_format, **options)
+        os.replace(temp_path, cached_path)
+
+    def rewrite_images(self, html_content, page_dir, source_dir=None):
+        """Add srcset, sizes, dimensions and lazy loading to local <img> tags.
+
+        Image sources are resolved against source_dir (default: page_dir) and
+        variants are written under page_dir.
+
+        Returns (html, image count, original bytes, bytes served at the largest variant).
+        """
+        stats = {'images': 0, 'original': 0, 'optimized': 0}
+        
+        def rewrite_tag(match):
+            attributes = dict(HTML_ATTRIBUTE_RE.findall(match.group(1)))
+            src = attributes.get('src', '')
+            if not src or 'srcset' in attributes or re.match(r'^(?:[a-z]+:|//|/)', src):
+                return match.group(0)
+            
+            info = self.image_info(Path(source_dir or page_dir) / unquote(src), page_dir)
+            if info is None:
+                return match.group(0)
+            
+            stats['images'] += 1
+            stats['original'] += info['bytes']
+            variants = info['variants']
+            size = info['size']
+            attributes['loading'] = 'lazy'
+            attributes['decoding'] = 'async'
+            if size:
+                attributes['width'], attributes['height'] = str(size[0]), str(size[1])
+            
+            # The original file stays as src so the zoom overlay shows it at full size
+            fallback = [(width, path) for format_name, entries in variants.items()
+                        if format_name not in self.modern_formats
+                        for width, path, _ in entries]
+            if fallback and size:
+                srcset = [f"{quote(path)} {width}w" for width, path in fallback]
+                srcset.append(f"{src} {size[0]}w")
+                attributes['srcset'] = ", ".join(srcset)
+                attributes['sizes'] = IMAGE_SIZES_ATTRIBUTE
+            
+            img_tag = "<img " + " ".join(f'{name}="{value}"' for name, value in attributes.items()) + " />"
+            sources = []
+            served_bytes = info['bytes']
+            for format_name in self.modern_formats:
+                entries = variants.get(format_name)
+                if not entries:
+                    continue
+                srcset = ", ".join(f"{quote(path)} {width}w" for width, path, _ in entries)
+                sources.append(f'<source type="image/{format_name}" srcset="{srcset}" '
+                               f'sizes="{IMAGE_SIZES_ATTRIBUTE}" />')
+                # Report the largest non-original variant a desktop browser would pick
+                served_bytes = min(served_bytes, max(
+                    (entry for entry in entries if entry[0] <= IMAGE_VARIANT_WIDTHS[-1]),
+                    default=entries[0])[2])
+            stats['optimized'] += served_bytes
+            
+            if not sources:
+                return img_tag
+            return "<picture>" + "".join(sources) + img_tag + "</picture>"
+        
+        html_content = IMG_TAG_RE.sub(rewrite_tag, html_content)
+        return html_content, stats['images'], stats['original'], stats['optimized']
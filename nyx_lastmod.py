@@ -0,0 +1,93 @@
+"""
+Content-based modification dates for the sitemap and feeds.
+
+Imported only when a base URL is known, since neither output is written
+without one.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from nyx_files import file_sha256, write_if_changed
+
+
+class LastModified:
+    """Stable last-modified dates for source files.
+
+    A file whose content hash matches the previous build keeps its recorded
+    date; otherwise it takes the date of its last commit, or today when it has
+    uncommitted changes. Fresh checkouts therefore get the same dates as the
+    last build instead of the checkout time.
+    """
+
+    def __init__(self, base_dir, cache_dir, use_cache=True):
+        self.base_dir = Path(base_dir)
+        self.record_path = Path(cache_dir) / "lastmod.json"
+        self.use_cache = use_cache
+        self.reset()
+    
+    def reset(self):
+        """Forget dates looked up so far; files are hashed again on the next lookup"""
+        self.record = None
+        self.current = {}
+        self.commit_dates = None
+        self.uncommitted = None
+
+    def load_git_history(self):
+        """Last commit date of every tracked file and the set of uncommitted ones, from two git calls"""
+        import subprocess
+        self.commit_dates = {}
+        self.uncommitted = set()
+        try:
+            log = subprocess.run(['git', 'log', '--format=%x00%cs', '--name-only', '--relative', '--', '.'],
+                                 cwd=self.base_dir, capture_output=True, text=True, check=True).stdout
+            changed = subprocess.run(['git', 'ls-files', '--modified', '--others', '--exclude-standard'],
+                                     cwd=self.base_dir, capture_output=True, text=True, check=True).stdout
+        except (OSError, subprocess.CalledProcessError):
+            # Not a git checkout: content hashes alone decide
+            return
+        date = None
+        for line in log.splitlines():
+            if line.startswith('\x00'):
+                date = line[1:]
+            elif line and line not in self.commit_dates:
+                # Newest commits come first
+                self.commit_dates[line] = date
+        self.uncommitted = set(changed.splitlines())
+
+    def date(self, path):
+        """YYYY-MM-DD the content of path last changed"""
+        key = Path(path).as_posix()
+        if key in self.current:
+            return self.current[key]['lastmod']
+        if self.record is None:
+            self.record = {}
+            if self.use_cache:
+                try:
+                    with open(self.record_path, 'r', encoding='utf-8') as f:
+                        self.record = json.load(f)
+                except (OSError, ValueError):
+                    pass
+        
+        digest = file_sha256(self.base_dir / key)
+        previous = self.record.get(key)
+        if previous and previous['sha256'] == digest:
+            lastmod = previous['lastmod']
+        else:
+            if self.commit_dates is None:
+                self.load_git_history()
+            lastmod = self.commit_dates.get(key)
+            if lastmod is None or key in self.uncommitted:
+                lastmod = datetime.now(timezone.utc).date().isoformat()
+        self.current[key] = {'sha256': digest, 'lastmod': lastmod}
+        return lastmod
+
+    def save(self):
+        """Keep the dates looked up in this build for the next one"""
+        if not self.use_cache or not self.current:
+            return
+        record = dict(self.record or {})
+        record.update(self.current)
+        self.record_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.record_path, json.dumps(record, sort_keys=True, indent=0))
@@ -0,0 +1,263 @@
+"""
+Markdown extensions used to render NYX posts.
+
+Kept out of main.py so that markdown and Pygments are only imported when a
+post actually has to be rendered; listing, sitemap and cached builds never
+load them.
+
+Importing this module replaces the CodeHilite class used by markdown's
+codehilite and fenced_code extensions with CachedCodeHilite, for every
+Markdown instance in the process. With no cache attached (the default) the
+subclass behaves exactly like CodeHilite.
+"""
+
+import re
+import xml.etree.ElementTree as etree
+from contextlib import nullcontext
+
+import markdown
+from markdown import util as markdown_util
+from markdown.blockprocessors import BlockProcessor
+from markdown.extensions import Extension
+from markdown.extensions import codehilite as codehilite_extension
+from markdown.extensions import fenced_code as fenced_code_extension
+from markdown.extensions.codehilite import CodeHilite
+from markdown.preprocessors import Preprocessor
+
+# Shared no-op context used when no profiler is attached
+NULL_STAGE = nullcontext()
+
+
+class CachedCodeHilite(CodeHilite):
+    """CodeHilite that consults the HighlightCache before running Pygments"""
+
+    # Set by PortfolioGenerator; None disables caching and profiling
+    cache = None
+    profiler = None
+
+    def stage(self, name):
+        profiler = CachedCodeHilite.profiler
+        return profiler.stage(name) if profiler is not None else NULL_STAGE
+
+    def hilite(self, shebang=True):
+        with self.stage('highlight cache'):
+            return self.cached_hilite(shebang)
+
+    def pygments_hilite(self, shebang):
+        with self.stage('pygments'):
+            return super().hilite(shebang)
+
+    def cached_hilite(self, shebang):
+        cache = CachedCodeHilite.cache
+        if cache is None or not cache.enabled or not (codehilite_extension.pygments and self.use_pygments):
+            return self.pygments_hilite(shebang)
+        
+        # Key on the state before hilite() strips the source or guesses a lexer
+        options = {
+            'shebang': shebang,
+            'guess_lang': self.guess_lang,
+            'lang_prefix': self.lang_prefix,
+            'formatter': self.pygments_formatter,
+            'options': self.options
+        }
+        key = cache.make_key(self.lang, self.src, options)
+        html_content = cache.get(key)
+        if html_content is None:
+            html_content = self.pygments_hilite(shebang)
+            cache.put(key, html_content)
+        return html_content
+
+
+# Both the codehilite tree processor and fenced_code build CodeHilite objects
+# through their module globals, so route them through the cached subclass.
+# This is process-wide, not limited to the Markdown instance create_markdown returns
+codehilite_extension.CodeHilite = CachedCodeHilite
+fenced_code_extension.CodeHilite = CachedCodeHilite
+
+
+# Start<Kind>Box ... End<Kind>Box info boxes and the class of the <div> each kind becomes
+CUSTOM_BOX_CLASSES = {
+    'Green': 'success-box',
+    'Red': 'danger-box',
+    'Blue': 'info-box',
+    'Purple': 'note-box',
+    'Yellow': 'warning-box'
+}
+CUSTOM_BOX_MARKER_RE = re.compile(r'(Start|End)(Green|Red|Blue|Purple|Yellow)Box')
+# Markers run from EndRedBox to StartPurpleBox; this is how far one can start before its "Box"
+CUSTOM_BOX_MARKER_REACH = len("StartPurple")
+CUSTOM_BOX_CODE_RE = re.compile(r'`+|~+')
+CUSTOM_BOX_FENCE_RE = re.compile(r'^[ \t]*(`{3,}|~{3,})', re.MULTILINE)
+# Placeholders the preprocessor leaves for the block processor; STX/ETX cannot occur in user text
+CUSTOM_BOX_OPEN = f"{markdown_util.STX}nyxbox:"
+CUSTOM_BOX_CLOSE = f"{markdown_util.STX}/nyxbox{markdown_util.ETX}"
+
+
+class CustomBoxPreprocessor(Preprocessor):
+    """Pairs box markers in one linear scan and isolates each as its own placeholder block.
+
+    Runs before the meta extension strips front matter so reported line
+    numbers match the source file. Markers inside fenced code and inline code
+    spans are left alone; unterminated or stray markers stay as plain text and
+    are reported.
+    """
+
+    def run(self, lines):
+        self.warnings = []
+        text = "\n".join(lines)
+        if 'Box' not in text:
+            return lines
+        
+        output = []
+        # (kind, index of the placeholder in output, offset of the marker)
+        stack = []
+        self.open_kinds = open_kinds = dict.fromkeys(CUSTOM_BOX_CLASSES, 0)
+        # str.find skips ahead far faster than any alternation regex, so the
+        # scan hops between "Box" hits and the next backtick or tilde fence
+        find = text.find
+        search = CUSTOM_BOX_MARKER_RE.search
+        tick = find('`')
+        tilde = find('~~~')
+        position = 0
+        scan = 0
+        while True:
+            box = find('Box', scan)
+            if box == -1:
+                break
+            # Once either runs out it stays -1, so neither is searched for twice
+            if -1 < tick < scan:
+                tick = find('`', scan)
+            if -1 < tilde < scan:
+                tilde = find('~~~', scan)
+            if -1 < tick < box or -1 < tilde < box:
+                scan = self.code_end(text, min(code for code in (tick, tilde) if code != -1))
+                continue
+            
+            match = search(text, max(scan, box - CUSTOM_BOX_MARKER_REACH), box + 3)
+            scan = box + 3
+            if match is None:
+                continue
+            action, kind = match.groups()
+            start = match.start()
+            if action == 'Start':
+                output.append(text[position:start])
+                stack.append((kind, len(output), start))
+                open_kinds[kind] += 1
+                output += [f"\n\n{CUSTOM_BOX_OPEN}{CUSTOM_BOX_CLASSES[kind]}{markdown_util.ETX}", "\n\n"]
+            elif open_kinds[kind]:
+                # Boxes opened inside this one but never closed end with it
+                while stack[-1][0] != kind:
+                    self.unterminated(text, output, *stack.pop())
+                stack.pop()
+                open_kinds[kind] -= 1
+                output += [text[position:start], f"\n\n{CUSTOM_BOX_CLOSE}\n\n"]
+            else:
+                # Stray markers stay in the text
+                number = text.count("\n", 0, start) + 1
+                self.warnings.append(f"End{kind}Box on line {number} has no matching Start{kind}Box")
+                continue
+            position = scan
+        output.append(text[position:])
+        
+        while stack:
+            self.unterminated(text, output, *stack.pop())
+        return "".join(output).split("\n")
+
+    def code_end(self, text, offset):
+        """Offset just past the fence, code span or literal run starting at offset"""
+        ticks = CUSTOM_BOX_CODE_RE.match(text, offset).group()
+        end = offset + len(ticks)
+        line_start = text.rfind("\n", 0, offset) + 1
+        if len(ticks) >= 3 and not text[line_start:offset].strip(" \t"):
+            return self.fence_end(text, ticks, end)
+        if ticks[0] == '`':
+            return self.code_span_end(text, ticks, end)
+        return end
+
+    def fence_end(self, text, opener, offset):
+        """Offset just past the fence closing the one opened with `opener`; unclosed fences run to the end"""
+        for match in CUSTOM_BOX_FENCE_RE.finditer(text, offset):
+            if match.group(1).startswith(opener):
+                return match.end()
+        return len(text)
+
+    def code_span_end(self, text, ticks, offset):
+        """Offset just past the inline code span opened by `ticks`, or offset when it is never closed.
+
+        A span closes at the next run of exactly as many backticks within the
+        same paragraph; otherwise the backticks are literal text.
+        """
+        close = offset
+        while True:
+            close = text.find(ticks, close)
+            if close == -1:
+                return offset
+            end = close + len(ticks)
+            if text.startswith('`', end):
+                # A longer run cannot close this span; skip all of it
+                while text.startswith('`', end):
+                    end += 1
+                close = end
+                continue
+            break
+        if text.find("\n\n", offset, close) != -1:
+            return offset
+        return end
+
+    def unterminated(self, text, output, kind, index, offset):
+        """Report an unclosed box and turn its placeholder back into plain text"""
+        # Line numbers are only needed for warnings, so count them lazily
+        number = text.count("\n", 0, offset) + 1
+        self.warnings.append(f"Start{kind}Box on line {number} is never closed")
+        # A later End<Kind>Box is stray rather than a close for this box
+        self.open_kinds[kind] -= 1
+        output[index] = f"Start{kind}Box"
+        output[index + 1] = ""
+
+
+class CustomBoxProcessor(BlockProcessor):
+    """Builds a <div> for each box placeholder and parses the blocks inside it as markdown"""
+
+    def test(self, parent, block):
+        return block.lstrip('\n').startswith(CUSTOM_BOX_OPEN)
+
+    def run(self, parent, blocks):
+        css_class = blocks.pop(0).strip()[len(CUSTOM_BOX_OPEN):-1]
+        # The preprocessor only emits balanced placeholders, so the matching close always exists
+        depth = 1
+        for index, block in enumerate(blocks):
+            # Consecutive blank lines leave leading newlines on a block
+            block = block.strip('\n')
+            if block.startswith(CUSTOM_BOX_OPEN):
+                depth += 1
+            elif block == CUSTOM_BOX_CLOSE:
+                depth -= 1
+                if depth == 0:
+                    break
+        else:
+            index = len(blocks)
+        inner = blocks[:index]
+        del blocks[:index + 1]
+        box = etree.SubElement(parent, 'div', {'class': css_class})
+        self.parser.parseBlocks(box, inner)
+
+
+class CustomBoxExtension(Extension):
+    """Start<Kind>Box ... End<Kind>Box info boxes with markdown content and nesting"""
+
+    def extendMarkdown(self, md):
+        # Priority 29 runs after whitespace normalisation but before front matter is removed
+        self.preprocessor = CustomBoxPreprocessor(md)
+        md.preprocessors.register(self.preprocessor, 'custom_boxes', 29)
+        md.parser.blockprocessors.register(CustomBoxProcessor(md.parser), 'custom_boxes', 105)
+
+    @property
+    def warnings(self):
+        return getattr(self.preprocessor, 'warnings', [])
+
+
+def create_markdown(extensions, extension_configs):
+    """Markdown instance with the given extensions plus custom boxes; returns (md, box extension)"""
+    custom_boxes = CustomBoxExtension()
+    md = markdown.Markdown(extensions=extensions + [custom_boxes], extension_configs=extension_configs)
+    return md, custom_boxes
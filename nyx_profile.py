@@ -0,0 +1,119 @@
+"""
+Stage timers behind --profile.
+
+Only imported when profiling is requested; without it the generator uses a
+no-op profiler whose stages cost nothing.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class ProfileStage:
+    """One timed stage; time spent in nested stages is subtracted from its self time"""
+
+    __slots__ = ('profiler', 'name', 'file', 'start', 'children')
+
+    def __init__(self, profiler, name, file):
+        self.profiler = profiler
+        self.name = name
+        self.file = file
+        self.children = 0
+
+    def __enter__(self):
+        stack = self.profiler.stack()
+        if self.file is None and stack:
+            # Nested stages are attributed to the file of their parent
+            self.file = stack[-1].file
+        stack.append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter_ns() - self.start
+        stack = self.profiler.stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += duration
+        self.profiler.events.append((self.name, self.file, self.start, duration,
+                                     duration - self.children, os.getpid(), threading.get_ident()))
+        return False
+
+
+class BuildProfiler:
+    """Per-stage monotonic timers for --profile"""
+
+    enabled = True
+
+    def __init__(self):
+        # (stage, file, start ns, duration ns, self ns, pid, thread id)
+        self.events = []
+        self.local = threading.local()
+
+    def stack(self):
+        """Stages currently open on this thread"""
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def stage(self, name, file=None):
+        """Context manager timing one stage, optionally attributed to a source file"""
+        return ProfileStage(self, name, str(file) if file is not None else None)
+
+    def drain(self):
+        """Return and forget the events recorded so far (used by worker processes)"""
+        events, self.events = self.events, []
+        return events
+
+    def report(self, top=10):
+        """Print the per-stage and slowest-files tables"""
+        if not self.events:
+            return
+        builds = [event[3] for event in self.events if event[0] == 'build']
+        wall = max(builds) if builds else sum(event[4] for event in self.events)
+        stages = {}
+        files = {}
+        for name, file, _, duration, self_time, _, _ in self.events:
+            calls, total, own = stages.get(name, (0, 0, 0))
+            stages[name] = (calls + 1, total + duration, own + self_time)
+            if file is not None:
+                files[file] = files.get(file, 0) + self_time
+        
+        print()
+        print(f"Build profile ({wall / 1e6:.1f} ms wall; worker time can exceed wall)")
+        print(f"{'stage':<20} {'calls':>7} {'self ms':>10} {'total ms':>10} {'self %':>7}")
+        for name, (calls, total, own) in sorted(stages.items(), key=lambda item: -item[1][2]):
+            share = 100 * own / wall if wall else 0
+            print(f"{name:<20} {calls:>7} {own / 1e6:>10.1f} {total / 1e6:>10.1f} {share:>6.1f}%")
+        
+        if files:
+            print()
+            print(f"Slowest {min(top, len(files))} files")
+            print(f"{'ms':>10}  file")
+            for file, own in sorted(files.items(), key=lambda item: -item[1])[:top]:
+                print(f"{own / 1e6:>10.1f}  {file}")
+
+    def write_trace(self, path):
+        """Write the recorded stages as Chrome trace-event JSON (chrome://tracing, Perfetto)"""
+        origin = min((event[2] for event in self.events), default=0)
+        trace_events = []
+        for name, file, start, duration, self_time, pid, tid in self.events:
+            event = {
+                'name': name,
+                'cat': 'build',
+                'ph': 'X',
+                'ts': (start - origin) / 1000,
+                'dur': duration / 1000,
+                'pid': pid,
+                'tid': tid,
+                'args': {'self_us': self_time / 1000}
+            }
+            if file is not None:
+                event['args']['file'] = file
+            trace_events.append(event)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        print(f"Profile trace written to {path}")
@@ -0,0 +1,217 @@
+"""
+Related-post suggestions from TF-IDF term vectors.
+
+Imported only when related posts are enabled; NumPy, when installed, is
+imported the first time similarities are computed.
+"""
+
+import hashlib
+import json
+import math
+import re
+import time
+from importlib.util import find_spec
+from pathlib import Path
+
+from nyx_files import write_if_changed
+from nyx_search import html_to_text, search_terms
+
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+
+RELATED_POST_COUNT = 3
+# Strongest terms kept per post; the rest barely move the similarity
+RELATED_MAX_TERMS = 40
+RELATED_FIELD_WEIGHTS = (('title', 4), ('tags', 4), ('category', 2), ('description', 2), ('text', 1))
+RELATED_INDEX_VERSION = "1"
+# Scores are rounded so NumPy and pure-Python summation order rank ties identically
+RELATED_SCORE_DIGITS = 9
+# Upper bound on the similarity cells held at once by the NumPy path
+RELATED_BLOCK_CELLS = 4 * 1024 * 1024
+MARKDOWN_FENCE_RE = re.compile(r'^(`{3,}|~{3,}).*?^\1', re.MULTILINE | re.DOTALL)
+MARKDOWN_LINK_TARGET_RE = re.compile(r'\]\([^)]*\)')
+
+
+class RelatedPosts:
+    """Finds each post's most similar posts by TF-IDF cosine similarity.
+
+    Per-post term vectors are cached by content, so only edited posts are
+    tokenized again; the similarity pass itself runs only when some vector
+    changed and uses sparse NumPy products when NumPy is installed.
+    """
+
+    def __init__(self, cache_dir, use_cache=True, count=RELATED_POST_COUNT):
+        self.cache_dir = Path(cache_dir) / "related"
+        self.use_cache = use_cache
+        self.count = count
+
+    def post_key(self, post, source):
+        """Hash of everything in a post that feeds its term vector"""
+        fields = [post.title, post.tags, post.category, post.description]
+        digest = hashlib.sha256(RELATED_INDEX_VERSION.encode('utf-8'))
+        digest.update(json.dumps(fields).encode('utf-8'))
+        digest.update(source)
+        return digest.hexdigest()
+
+    def post_terms(self, post, key, source):
+        """Return the strongest {term: weight} of a post, reusing cached results for unchanged posts"""
+        cache_path = self.cache_dir / f"{key}.json"
+        if self.use_cache:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        
+        # Code listings and link targets say little about what a post is about
+        text = MARKDOWN_FENCE_RE.sub(' ', source.decode('utf-8', errors='replace'))
+        text = html_to_text(MARKDOWN_LINK_TARGET_RE.sub(']', text))
+        fields = {
+            'title': post.title,
+            'tags': " ".join(post.tags),
+            'category': post.category,
+            'description': post.description,
+            'text': text,
+        }
+        weights = {}
+        for field, weight in RELATED_FIELD_WEIGHTS:
+            for term in search_terms(fields[field]):
+                weights[term] = weights.get(term, 0) + weight
+        strongest = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:RELATED_MAX_TERMS]
+        weights = dict(strongest)
+        
+        if self.use_cache:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(weights, f)
+        return weights
+
+    def weighted_entries(self, vectors):
+        """Unit-length TF-IDF vectors as (doc, term id, weight) entries, doc by doc.
+
+        Terms found in a single post still count towards its length but are
+        left out of the entries, since they cannot make two posts similar.
+        """
+        document_frequency = {}
+        for vector in vectors:
+            for term in vector:
+                document_frequency[term] = document_frequency.get(term, 0) + 1
+        term_ids = {}
+        total_docs = len(vectors)
+        entries = []
+        for doc_id, vector in enumerate(vectors):
+            weights = {term: (1 + math.log(weight)) * math.log(1 + total_docs / document_frequency[term])
+                       for term, weight in vector.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            for term, weight in sorted(weights.items()):
+                if document_frequency[term] > 1:
+                    entries.append((doc_id, term_ids.setdefault(term, len(term_ids)), weight / norm))
+        return entries, len(term_ids)
+
+    def build(self, posts):
+        """Indexes of each post's related posts, recomputed only when some post's vector changed"""
+        keys = []
+        for post in posts:
+            with open(post.file_path, 'rb') as f:
+                keys.append(self.post_key(post, f.read()))
+        digest = hashlib.sha256(f"{RELATED_INDEX_VERSION} {self.count}\n".encode('utf-8'))
+        for key in keys:
+            digest.update(f"{key}\n".encode('utf-8'))
+        corpus_key = digest.hexdigest()
+        
+        corpus_path = self.cache_dir / "corpus.json"
+        if self.use_cache:
+            try:
+                with open(corpus_path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached['key'] == corpus_key:
+                    print("Related posts up to date")
+                    return cached['related']
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        vectors = []
+        for post, key in zip(posts, keys):
+            with open(post.file_path, 'rb') as f:
+                vectors.append(self.post_terms(post, key, f.read()))
+        start = time.perf_counter()
+        related = self.similar(vectors)
+        print(f"Related posts: {len(posts)} posts compared with {'NumPy' if NUMPY_AVAILABLE else 'Python'} "
+              f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+        if self.use_cache:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_if_changed(corpus_path, json.dumps({'key': corpus_key, 'related': related}))
+        return related
+
+    def similar(self, vectors):
+        """For each vector, the indexes of the most similar others, best first"""
+        entries, term_count = self.weighted_entries(vectors)
+        if NUMPY_AVAILABLE:
+            return self.similar_numpy(entries, term_count, len(vectors))
+        
+        postings = {}
+        for doc_id, term_id, weight in entries:
+            postings.setdefault(term_id, []).append((doc_id, weight))
+        by_doc = [[] for _ in vectors]
+        for doc_id, term_id, weight in entries:
+            by_doc[doc_id].append((term_id, weight))
+        
+        # Accumulate dot products through the postings of each post's terms
+        related = []
+        for doc_id, terms in enumerate(by_doc):
+            scores = {}
+            for term_id, weight in terms:
+                for other, other_weight in postings[term_id]:
+                    if other != doc_id:
+                        scores[other] = scores.get(other, 0.0) + weight * other_weight
+            ranked = sorted(((round(score, RELATED_SCORE_DIGITS), other) for other, score in scores.items()),
+                            key=lambda item: (-item[0], item[1]))
+            related.append([other for score, other in ranked[:self.count] if score > 0])
+        return related
+
+    def similar_numpy(self, entries, term_count, doc_count):
+        """similar() as blocks of sparse-by-sparse products over the term postings"""
+        import numpy as np
+        related = [[] for _ in range(doc_count)]
+        if not entries:
+            return related
+        rows = np.array([entry[0] for entry in entries], dtype=np.int64)
+        cols = np.array([entry[1] for entry in entries], dtype=np.int64)
+        vals = np.array([entry[2] for entry in entries], dtype=np.float64)
+        
+        # Postings: entries regrouped by term, with each term's slice in term_ptr
+        order = np.argsort(cols, kind='stable')
+        posting_docs = rows[order]
+        posting_vals = vals[order]
+        term_ptr = np.zeros(term_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=term_count), out=term_ptr[1:])
+        doc_ptr = np.searchsorted(rows, np.arange(doc_count + 1))
+        
+        block = max(1, RELATED_BLOCK_CELLS // doc_count)
+        for start in range(0, doc_count, block):
+            stop = min(start + block, doc_count)
+            first, last = doc_ptr[start], doc_ptr[stop]
+            block_rows = rows[first:last] - start
+            block_cols = cols[first:last]
+            lengths = term_ptr[block_cols + 1] - term_ptr[block_cols]
+            
+            # Pair every entry of the block with every posting of its term
+            total = int(lengths.sum())
+            ends = np.cumsum(lengths)
+            positions = np.repeat(term_ptr[block_cols] - (ends - lengths), lengths) + np.arange(total)
+            cells = np.repeat(block_rows, lengths) * doc_count + posting_docs[positions]
+            products = np.repeat(vals[first:last], lengths) * posting_vals[positions]
+            scores = np.bincount(cells, weights=products, minlength=(stop - start) * doc_count)
+            scores = np.round(scores.reshape(stop - start, doc_count), RELATED_SCORE_DIGITS)
+            scores[np.arange(stop - start), np.arange(start, stop)] = 0.0
+            
+            # Only cells at least as good as each row's count-th best need sorting;
+            # ties are broken by index like the pure-Python path
+            if self.count < doc_count:
+                thresholds = np.partition(scores, doc_count - self.count, axis=1)[:, doc_count - self.count]
+            else:
+                thresholds = np.zeros(stop - start)
+            for offset, row in enumerate(scores):
+                candidates = np.flatnonzero((row >= thresholds[offset]) & (row > 0))
+                best = candidates[np.argsort(-row[candidates], kind='stable')]
+                related[start + offset] = best[:self.count].tolist()
+        return related
@@ -0,0 +1,173 @@
+"""
+Sharded client-side search index, loaded by assets/search.js.
+
+Imported only when the search index is enabled.
+"""
+
+import hashlib
+import html
+import json
+import math
+import re
+from pathlib import Path
+
+SEARCH_TOKEN_RE = re.compile(r'[a-z0-9]+')
+SEARCH_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the "
+    "this to was we were will with you your i if not so can".split()
+)
+# Relative weight of each field when scoring a term for a post
+SEARCH_FIELD_WEIGHTS = (('title', 8), ('tags', 4), ('category', 3), ('text', 1))
+# Shards are keyed by the first characters of a term; shards above the target
+# size are split on longer prefixes so no single download gets too large
+SEARCH_PREFIX_LENGTH = 2
+SEARCH_MAX_PREFIX_LENGTH = 8
+# Shorter query terms only match whole terms instead of every completion
+SEARCH_MIN_COMPLETION_LENGTH = 3
+SEARCH_SHARD_TARGET_BYTES = 48 * 1024
+# Terms in more posts than this keep only their best-scoring postings and are
+# listed as capped, so the client does not use them to narrow results
+SEARCH_MAX_POSTINGS = 200
+SEARCH_INDEX_VERSION = "2"
+
+
+def search_terms(text):
+    """Split text into lowercase search terms"""
+    return [term for term in SEARCH_TOKEN_RE.findall(text.lower())
+            if len(term) >= SEARCH_PREFIX_LENGTH and term not in SEARCH_STOPWORDS]
+
+
+def html_to_text(html_content):
+    """Strip tags and entities from rendered HTML"""
+    return html.unescape(re.sub(r'<[^<]+?>', ' ', html_content))
+
+
+class SearchIndexer:
+    """Builds a prefix-sharded inverted index for client-side search"""
+
+    def __init__(self, cache_dir, use_cache=True):
+        self.cache_dir = Path(cache_dir) / "search"
+        self.use_cache = use_cache
+        self.reset()
+
+    def reset(self):
+        """Forget the documents added for the previous build"""
+        # url -> (doc row, post key, {term: weight}), in the order posts were added
+        self.entries = {}
+
+    def post_key(self, post, content):
+        """Hash of everything in a post that feeds the index"""
+        fields = [post.title, post.tags, post.category, post.date]
+        digest = hashlib.sha256(SEARCH_INDEX_VERSION.encode('utf-8'))
+        digest.update(json.dumps(fields).encode('utf-8'))
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def post_terms(self, post, key, content):
+        """Return {term: weight} for a post, reusing cached results for unchanged posts"""
+        fields = {
+            'title': post.title,
+            'tags': " ".join(post.tags),
+            'category': post.category,
+        }
+        cache_path = self.cache_dir / f"{key}.json"
+        if self.use_cache:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass
+        
+        fields['text'] = html_to_text(content)
+        weights = {}
+        for field, weight in SEARCH_FIELD_WEIGHTS:
+            for term in search_terms(fields[field]):
+                weights[term] = weights.get(term, 0) + weight
+        
+        if self.use_cache:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(weights, f)
+        return weights
+
+    def add(self, post, url, kind, content):
+        """Index one post while its rendered content is at hand, replacing an earlier version of it"""
+        key = self.post_key(post, content)
+        self.entries[url] = ([post.title, url, kind, post.date], key, self.post_terms(post, key, content))
+
+    def remove(self, url):
+        """Drop a post that no longer exists from the index"""
+        self.entries.pop(url, None)
+
+    def corpus_key(self):
+        """Hash identifying the whole index; unchanged when no post changed"""
+        digest = hashlib.sha256()
+        for url, (doc, key, _) in self.entries.items():
+            digest.update(f"{key} {url} {doc[2]}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def build(self):
+        """Build index files from the documents added so far.
+
+        Returns {relative file name: JSON text}.
+        """
+        docs = []
+        postings = {}
+        for doc_id, (doc, _, weights) in enumerate(self.entries.values()):
+            docs.append(doc)
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((doc_id, weight))
+        
+        # Score = dampened term weight scaled by inverse document frequency
+        total_docs = max(len(docs), 1)
+        term_postings = {}
+        capped = []
+        for term, entries in postings.items():
+            idf = math.log(1 + total_docs / len(entries))
+            scored = sorted(((doc_id, round((1 + math.log(weight)) * idf * 100))
+                             for doc_id, weight in entries), key=lambda entry: -entry[1])
+            term_postings[term] = [value for entry in scored[:SEARCH_MAX_POSTINGS] for value in entry]
+            if len(scored) > SEARCH_MAX_POSTINGS:
+                capped.append(term)
+        
+        shards = self.assign_shards(term_postings)
+        
+        # The client needs the same tokenizer settings and the shard list to look terms up
+        meta = {
+            'docs': docs,
+            'prefix': SEARCH_PREFIX_LENGTH,
+            'complete': SEARCH_MIN_COMPLETION_LENGTH,
+            'shards': sorted(shards),
+            'stopwords': sorted(SEARCH_STOPWORDS),
+            'capped': sorted(capped),
+        }
+        files = {'docs.json': json.dumps(meta, separators=(',', ':'))}
+        for key, terms in shards.items():
+            shard = {term: term_postings[term] for term in terms}
+            files[f"{key}.json"] = json.dumps(shard, separators=(',', ':'), sort_keys=True)
+        return files
+
+    def assign_shards(self, term_postings):
+        """Group terms into shards by prefix, splitting oversized groups.
+
+        Returns {shard key: [terms]}. A query term needs every shard whose key
+        is a prefix of the term or starts with the term.
+        """
+        # Rough serialized size of each term's entry
+        sizes = {term: len(term) + 4 + 6 * len(values) for term, values in term_postings.items()}
+        shards = {}
+        
+        def split(terms, prefix_length):
+            groups = {}
+            for term in terms:
+                groups.setdefault(term[:prefix_length], []).append(term)
+            for key, group in groups.items():
+                oversized = sum(sizes[term] for term in group) > SEARCH_SHARD_TARGET_BYTES
+                if (oversized and prefix_length < SEARCH_MAX_PREFIX_LENGTH
+                        and any(len(term) > prefix_length for term in group)):
+                    split(group, prefix_length + 1)
+                else:
+                    shards[key] = group
+        
+        split(list(term_postings), SEARCH_PREFIX_LENGTH)
+        return shards